@@ -0,0 +1,98 @@
+"""Compare the HTTP transports against a local HTTP server.
+
+Each backend sends the same number of GET requests, shaped like an export
+progress poll, through ``BaseClient._make_request``. Reports requests per
+second and p50/p99 latency.
+
+    python benchmarks/transport_benchmark.py --requests 2000 --concurrency 8
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pyqual.client import BaseClient
+from pyqual.transport import TRANSPORTS
+
+PAYLOAD = json.dumps({
+    "result": {"status": "inProgress", "percentComplete": 42.0},
+    "meta": {"requestId": "00000000-0000-0000-0000-000000000000", "httpStatus": "200 - OK"},
+}).encode()
+
+
+class ProgressHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_backend(name, url, total, concurrency):
+    client = BaseClient(token='benchmark', transport=name, retry=0, stream=False)
+
+    def timed_request(_):
+        start = time.perf_counter()
+        client._make_request('GET', url=url).json()
+        return time.perf_counter() - start
+
+    # Warm up the connection pool so connection setup is not measured.
+    for _ in range(concurrency):
+        timed_request(None)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_request, range(total)))
+    elapsed = time.perf_counter() - started
+    client.__exit__()
+
+    return {
+        'transport': name,
+        'requests_per_second': round(total / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per transport.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent requests in flight.')
+    parser.add_argument('--transport', action='append', choices=sorted(TRANSPORTS),
+                        help='Transport to benchmark; repeat for several (default: all installed).')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ProgressHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/API/v3/surveys/SV_1/export-responses/ES_1'
+
+    try:
+        for name in args.transport or sorted(TRANSPORTS):
+            try:
+                result = run_backend(name, url, args.requests, args.concurrency)
+            except ImportError as import_error:
+                result = {'transport': name, 'skipped': str(import_error)}
+            print(json.dumps(result))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import sys
+
+from pyqual.cli import main
+
+sys.exit(main())
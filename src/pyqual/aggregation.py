@@ -0,0 +1,350 @@
+"""One-pass aggregation over downloaded response exports.
+
+Rows are streamed from the CSV (or TSV) file, optionally straight out of the
+export archive, and aggregated in fixed-size chunks, so memory use depends on
+``chunk_size``, never on the number of responses.
+
+Parsing dominates the cost, so an extracted file can be split across a process
+pool: the parent only cuts the file into byte ranges that end on record
+boundaries (a newline outside quotes, found by quote parity as in
+:class:`~pyqual.reader.ExportReader`), and every worker parses and aggregates
+its own range. Ranges are capped at :data:`MAX_RANGE_BYTES` and streamed
+through a bounded reader, so the memory of a worker does not grow with the
+file either. Archives are read in a single process, since a compressed
+member cannot be read from the middle.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import mmap
+import os
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Sequence, TextIO, Tuple
+
+from pyqual.constants import QUALTRICS_HEADER_ROWS
+from pyqual.exceptions import InputError
+
+TABULAR_SUFFIXES = {'.csv': ',', '.tsv': '\t'}
+# Byte ranges handed to each worker process; more than one evens out uneven ranges.
+RANGES_PER_PROCESS = 4
+# Largest byte range handed to a worker, so large exports are cut into more ranges.
+MAX_RANGE_BYTES = 64 * 1024 * 1024
+# Bytes scanned at a time when counting quotes and when streaming a range.
+WINDOW_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Frequency:
+    """Count how often each answer occurs in ``column``."""
+    column: str
+    include_blank: bool = False
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def initial(self) -> Counter:
+        return Counter()
+
+    def update(self, state: Counter, rows: Sequence[Sequence[str]], index: Mapping[str, int]) -> Counter:
+        position = index[self.column]
+        values = (row[position] if position < len(row) else '' for row in rows)
+        state.update(value for value in values if value or self.include_blank)
+        return state
+
+    def merge(self, state: Counter, other: Counter) -> Counter:
+        state.update(other)
+        return state
+
+    def result(self, state: Counter) -> Dict[str, int]:
+        return dict(state.most_common())
+
+
+@dataclass(frozen=True)
+class Mean:
+    """Average the numeric answers in ``column``, skipping blanks and non-numbers."""
+    column: str
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def initial(self) -> Tuple[int, float]:
+        return 0, 0.0
+
+    def update(self, state: Tuple[int, float], rows: Sequence[Sequence[str]],
+               index: Mapping[str, int]) -> Tuple[int, float]:
+        position = index[self.column]
+        count, total = state
+        for row in rows:
+            if position >= len(row):
+                continue
+            try:
+                value = float(row[position])
+            except ValueError:
+                continue
+            count += 1
+            total += value
+        return count, total
+
+    def merge(self, state: Tuple[int, float], other: Tuple[int, float]) -> Tuple[int, float]:
+        return state[0] + other[0], state[1] + other[1]
+
+    def result(self, state: Tuple[int, float]) -> Dict[str, Any]:
+        count, total = state
+        return {'count': count, 'mean': total / count if count else None}
+
+
+@dataclass(frozen=True)
+class CrossTab:
+    """Count answer combinations of ``row`` against ``column``."""
+    row: str
+    column: str
+    include_blank: bool = False
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.row, self.column
+
+    def initial(self) -> Counter:
+        return Counter()
+
+    def update(self, state: Counter, rows: Sequence[Sequence[str]], index: Mapping[str, int]) -> Counter:
+        row_position, column_position = index[self.row], index[self.column]
+        width = max(row_position, column_position)
+        for row in rows:
+            if width >= len(row):
+                continue
+            pair = row[row_position], row[column_position]
+            if self.include_blank or (pair[0] and pair[1]):
+                state[pair] += 1
+        return state
+
+    def merge(self, state: Counter, other: Counter) -> Counter:
+        state.update(other)
+        return state
+
+    def result(self, state: Counter) -> Dict[str, Dict[str, int]]:
+        table: Dict[str, Dict[str, int]] = {}
+        for (row_value, column_value), count in sorted(state.items()):
+            table.setdefault(row_value, {})[column_value] = count
+        return table
+
+
+def _find_export_file(path: Path) -> Path:
+    if path.is_dir():
+        candidates = sorted(entry for entry in path.iterdir() if entry.suffix.lower() in TABULAR_SUFFIXES)
+        if len(candidates) != 1:
+            raise InputError(f'Expected exactly one CSV or TSV export in {path}, found {len(candidates)}')
+        return candidates[0]
+    return path
+
+
+def _is_archive(path: Path) -> bool:
+    return zipfile.is_zipfile(path)
+
+
+@contextmanager
+def _open_rows(path: Path) -> Iterator[Iterator[List[str]]]:
+    if _is_archive(path):
+        with zipfile.ZipFile(path) as archive:
+            members = [name for name in archive.namelist() if Path(name).suffix.lower() in TABULAR_SUFFIXES]
+            if len(members) != 1:
+                raise InputError(f'Expected exactly one CSV or TSV export in {path}, found {len(members)}')
+            delimiter = TABULAR_SUFFIXES[Path(members[0]).suffix.lower()]
+            with archive.open(members[0]) as raw:
+                text: TextIO = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+                yield csv.reader(text, delimiter=delimiter)
+        return
+
+    with open(path, encoding='utf-8-sig', newline='') as text:
+        yield csv.reader(text, delimiter=_delimiter(path))
+
+
+def _delimiter(path: Path) -> str:
+    if path.suffix.lower() not in TABULAR_SUFFIXES:
+        raise InputError(f'Unsupported export file {path}; expected CSV, TSV or a zip archive of one')
+    return TABULAR_SUFFIXES[path.suffix.lower()]
+
+
+def _chunks(rows: Iterator[List[str]], chunk_size: int) -> Iterator[List[List[str]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _column_index(header: List[str], aggregations: Mapping[str, Any]) -> Dict[str, int]:
+    index = {column: position for position, column in enumerate(header)}
+    missing = sorted({
+        column for aggregation in aggregations.values() for column in aggregation.columns
+    } - set(index))
+    if missing:
+        raise InputError(f'Columns not in export: {", ".join(missing)}')
+    return index
+
+
+def _aggregate_rows(aggregations: Mapping[str, Any], index: Mapping[str, int],
+                    rows: Iterator[List[str]], chunk_size: int) -> Dict[str, Any]:
+    states = {name: aggregation.initial() for name, aggregation in aggregations.items()}
+    for chunk in _chunks(rows, chunk_size):
+        for name, aggregation in aggregations.items():
+            states[name] = aggregation.update(states[name], chunk, index)
+    return states
+
+
+def _record_end(data: mmap.mmap, position: int, size: int, quotes: int = 0) -> int:
+    """Return where the record running through ``position`` ends.
+    ``quotes`` counts the quotes between the start of the record and ``position``; a
+    line break only ends the record once the quotes seen are balanced.
+    """
+    while position < size:
+        line_end = data.find(b'\n', position)
+        line_end = size if line_end == -1 else line_end + 1
+        quotes += _count_quotes(data, position, line_end)
+        position = line_end
+        if quotes % 2 == 0:
+            break
+    return position
+
+
+def _count_quotes(data: mmap.mmap, start: int, end: int) -> int:
+    """Count the quotes in ``data[start:end]``, one window at a time."""
+    quotes = 0
+    for window_start in range(start, end, WINDOW_BYTES):
+        quotes += data[window_start:min(end, window_start + WINDOW_BYTES)].count(b'"')
+    return quotes
+
+
+def _split_records(data: mmap.mmap, start: int, size: int, parts: int) -> List[Tuple[int, int]]:
+    """Cut ``data[start:size]`` into about ``parts`` ranges of whole records, none much over
+    :data:`MAX_RANGE_BYTES`."""
+    target = max(1, min(MAX_RANGE_BYTES, (size - start) // parts))
+    ranges = []
+    while start < size:
+        candidate = min(size, start + target)
+        end = _record_end(data, candidate, size, _count_quotes(data, start, candidate))
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+class _RangeReader(io.RawIOBase):
+    """Read at most ``length`` bytes of ``raw`` from its current position."""
+
+    def __init__(self, raw: BinaryIO, length: int) -> None:
+        self._raw = raw
+        self._remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        count = self._raw.readinto(memoryview(buffer)[:size])
+        self._remaining -= count
+        return count
+
+
+def _aggregate_range(path: str, start: int, end: int, delimiter: str, aggregations: Mapping[str, Any],
+                     index: Mapping[str, int], chunk_size: int) -> Dict[str, Any]:
+    with open(path, 'rb') as export_file:
+        export_file.seek(start)
+        reader = io.BufferedReader(_RangeReader(export_file, end - start), buffer_size=WINDOW_BYTES)
+        with io.TextIOWrapper(reader, encoding='utf-8', newline='') as text:
+            return _aggregate_rows(aggregations, index, csv.reader(text, delimiter=delimiter), chunk_size)
+
+
+def aggregate_export(
+        path: str | os.PathLike[str],
+        aggregations: Mapping[str, Any],
+        processes: int | None = 1,
+        chunk_size: int = 10_000,
+        header_rows: int = QUALTRICS_HEADER_ROWS,
+) -> Dict[str, Any]:
+    """Run several aggregations over an export in a single pass.
+    Parameters
+    ----------
+    path: str or path-like
+         A CSV/TSV export, a zip archive holding one, or the directory ``export_survey`` extracted it to.
+    aggregations: dict
+        Maps result names to aggregations such as :class:`Frequency`, :class:`Mean` or :class:`CrossTab`.
+    processes: int
+        Worker processes parsing an extracted file in parallel; ``None`` uses every CPU.
+        Archives are always aggregated in this process.
+    chunk_size: int
+        Rows aggregated at a time.
+    header_rows: int
+        Header rows at the top of the file, the first of which names the columns.
+    Returns
+    -------
+    dict
+        The summary table of each aggregation, under its name.
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+
+    path = _find_export_file(Path(path))
+    processes = processes or os.cpu_count() or 1
+
+    if processes > 1 and not _is_archive(path):
+        states = _aggregate_parallel(path, aggregations, processes, chunk_size, header_rows)
+    else:
+        with _open_rows(path) as rows:
+            try:
+                header = next(rows)
+            except StopIteration:
+                raise InputError(f'Export {path} is empty') from None
+            for _ in range(header_rows - 1):
+                next(rows, None)
+
+            index = _column_index(header, aggregations)
+            states = _aggregate_rows(aggregations, index, rows, chunk_size)
+
+    return {name: aggregation.result(states[name]) for name, aggregation in aggregations.items()}
+
+
+def _aggregate_parallel(path: Path, aggregations: Mapping[str, Any], processes: int, chunk_size: int,
+                        header_rows: int) -> Dict[str, Any]:
+    delimiter = _delimiter(path)
+    with open(path, 'rb') as export_file:
+        size = os.fstat(export_file.fileno()).st_size
+        if not size:
+            raise InputError(f'Export {path} is empty')
+
+        with mmap.mmap(export_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 3 if data[:3] == b'\xef\xbb\xbf' else 0
+            header_end = _record_end(data, start, size)
+            header_text = io.StringIO(data[start:header_end].decode('utf-8'), newline='')
+            header = next(csv.reader(header_text, delimiter=delimiter), [])
+
+            body_start = header_end
+            for _ in range(header_rows - 1):
+                body_start = _record_end(data, body_start, size)
+            ranges = _split_records(data, body_start, size, processes * RANGES_PER_PROCESS)
+
+    index = _column_index(header, aggregations)
+    states = {name: aggregation.initial() for name, aggregation in aggregations.items()}
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_aggregate_range, os.fspath(path), start, end, delimiter, aggregations, index, chunk_size)
+            for start, end in ranges
+        ]
+        for future in futures:
+            partial = future.result()
+            for name, aggregation in aggregations.items():
+                states[name] = aggregation.merge(states[name], partial[name])
+    return states
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms only get in-process locking.
+    fcntl = None
+
+ENTRY_SUFFIX = '.export'
+LOCK_SUFFIX = '.lock'
+# Leading key characters naming a lock shard; hex keys share at most 256 lock files.
+LOCK_SHARD_CHARS = 2
+
+
+class ExportCache:
+    """Local, content-addressed store of completed export archives.
+
+    Archives are keyed by everything that determines their content: the survey,
+    the export request sent to Qualtrics and the survey's last modification
+    time. Once the total size exceeds ``max_bytes`` the least recently used
+    archives are removed.
+
+    Entries are stored exactly as downloaded under a neutral ``.export``
+    suffix: a zip archive, or the bare file of an export requested with
+    ``compress=False`` (which has its own cache key, as the body differs).
+
+    Parameters
+    ----------
+        directory: str or path-like
+            Where archives are kept. Several processes may share it.
+        max_bytes: int
+            Size the cache is trimmed back to after every insert.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int = 1024 ** 3) -> None:
+        if max_bytes < 0:
+            raise ValueError('max_bytes must not be negative')
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(directory={str(self.directory)!r}, max_bytes={self.max_bytes!r})'
+
+    @staticmethod
+    def key(survey_id: str, last_modified: str, payload: Dict[str, Any]) -> str:
+        """Return the cache key for an export request.
+        Parameters
+        ----------
+        survey_id: str
+             The id for the survey.
+        last_modified: str
+            The survey's ``lastModified`` timestamp.
+        payload: dict
+            The export request body (format, filter and options).
+        Returns
+        -------
+        str
+            Hex digest identifying the export.
+
+        """
+        normalized = json.dumps(
+            {'survey_id': survey_id, 'last_modified': last_modified, 'payload': payload},
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str,
+        )
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f'{key}{ENTRY_SUFFIX}'
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached archive for ``key``, or ``None`` on a miss."""
+        path = self._entry_path(key)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return content
+
+    def put(self, key: str, content: bytes) -> Path:
+        """Store an archive atomically, then evict down to ``max_bytes``."""
+        path = self._entry_path(key)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as temp_file:
+            temp_file.write(content)
+        os.replace(temp_file.name, path)
+        self.evict()
+        return path
+
+    def size(self) -> int:
+        """Return the combined size of every cached archive in bytes."""
+        return sum(entry.stat().st_size for entry in self.directory.glob(f'*{ENTRY_SUFFIX}'))
+
+    def evict(self) -> None:
+        """Remove least recently used archives until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self.directory.glob(f'*{ENTRY_SUFFIX}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold an exclusive lock on ``key`` across threads and processes.
+
+        Keys are locked by shard, so the number of lock files stays bounded
+        however many entries come and go; keys sharing a shard wait on each other.
+        """
+        shard = key[:LOCK_SHARD_CHARS]
+        with self._locks_guard:
+            thread_lock = self._locks.setdefault(shard, threading.Lock())
+
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            with open(self.directory / f'{shard}{LOCK_SUFFIX}', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,136 @@
+"""Command-line interface for PyQual.
+
+The heavy modules (``requests`` and the clients built on it) are only imported
+once a command actually runs, so ``pyqual --help`` and argument errors return
+without paying for them.
+"""
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, Sequence, TextIO
+
+
+def _emit(stream: TextIO, record: Dict[str, Any]) -> None:
+    stream.write(json.dumps(record, default=str) + "\n")
+    stream.flush()
+
+
+def _client_kwargs(args: argparse.Namespace) -> Dict[str, Any]:
+    return {'token': args.token or '', 'data_center': args.data_center}
+
+
+def _list_surveys(args: argparse.Namespace, out: TextIO) -> int:
+    from dataclasses import asdict
+
+    from pyqual.client import QualtricsManageSurveyClient
+    from pyqual.models import QualtricsSurvey
+
+    with QualtricsManageSurveyClient(**_client_kwargs(args)) as client:
+        for survey in client.get_all_surveys(limit=args.limit):
+            _emit(out, asdict(QualtricsSurvey.from_dict(survey)))
+    return 0
+
+
+def _export_surveys(args: argparse.Namespace, out: TextIO) -> int:
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from pathlib import Path
+
+    from pyqual.client import QualtricsResponseExportClient
+
+    failures = 0
+    output_root = Path(args.output_dir)
+
+    with QualtricsResponseExportClient(**_client_kwargs(args)) as client:
+        def export(survey_id: str):
+            return client.export_survey(
+                survey_id,
+                args.format,
+                filter_id=args.filter_id,
+                output_dir=output_root / survey_id,
+                poll_interval=args.poll_interval,
+            )
+
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = {executor.submit(export, survey_id): survey_id for survey_id in dict.fromkeys(args.survey_ids)}
+            for future in as_completed(futures):
+                survey_id = futures[future]
+                try:
+                    path = future.result()
+                except Exception as error:
+                    failures += 1
+                    _emit(out, {'survey_id': survey_id, 'status': 'error', 'error': str(error)})
+                else:
+                    _emit(out, {'survey_id': survey_id, 'status': 'ok', 'path': str(path)})
+
+    return 1 if failures else 0
+
+
+def _set_active(active: bool) -> Callable[[argparse.Namespace, TextIO], int]:
+    def command(args: argparse.Namespace, out: TextIO) -> int:
+        from pyqual.client import QualtricsManageSurveyClient
+
+        failures = 0
+        with QualtricsManageSurveyClient(**_client_kwargs(args)) as client:
+            toggle = client.activate_survey if active else client.deactivate_survey
+            for survey_id in dict.fromkeys(args.survey_ids):
+                try:
+                    toggle(survey_id)
+                except Exception as error:
+                    failures += 1
+                    _emit(out, {'survey_id': survey_id, 'status': 'error', 'error': str(error)})
+                else:
+                    _emit(out, {'survey_id': survey_id, 'status': 'ok', 'active': active})
+
+        return 1 if failures else 0
+
+    return command
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the ``pyqual`` command."""
+    parser = argparse.ArgumentParser(
+        prog='pyqual',
+        description='Work with Qualtrics surveys. Results are written to stdout as JSON lines.',
+    )
+    parser.add_argument('--token', help='Qualtrics API token (defaults to $QUALTRICS_TOKEN).')
+    parser.add_argument('--data-center', default='fra1', help='Qualtrics data center (default: fra1).')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    surveys = subparsers.add_parser('surveys', help='List surveys available to the account.')
+    surveys.add_argument('--limit', type=int, default=500, help='Maximum number of surveys (at least 100).')
+    surveys.set_defaults(handler=_list_surveys)
+
+    export = subparsers.add_parser('export', help='Export responses for one or more surveys.')
+    export.add_argument('survey_ids', nargs='+', metavar='SURVEY_ID')
+    export.add_argument('--format', default='csv', help='Export file format (default: csv).')
+    export.add_argument('--filter-id', default=None, help='Restrict the export to a saved filter.')
+    export.add_argument('--output-dir', default='MyQualtricsDownload',
+                        help='Directory receiving one sub-directory per survey.')
+    export.add_argument('--workers', type=int, default=4, help='Number of exports run concurrently.')
+    export.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between progress checks.')
+    export.set_defaults(handler=_export_surveys)
+
+    activate = subparsers.add_parser('activate', help='Activate one or more surveys.')
+    activate.add_argument('survey_ids', nargs='+', metavar='SURVEY_ID')
+    activate.set_defaults(handler=_set_active(True))
+
+    deactivate = subparsers.add_parser('deactivate', help='Deactivate one or more surveys.')
+    deactivate.add_argument('survey_ids', nargs='+', metavar='SURVEY_ID')
+    deactivate.set_defaults(handler=_set_active(False))
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the ``pyqual`` command and return its exit status."""
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+
+    # The clients report progress with print(); keep stdout clean for JSON lines.
+    with redirect_stdout(sys.stderr):
+        try:
+            return args.handler(args, out)
+        except Exception as error:
+            print(f'pyqual: error: {error}', file=sys.stderr)
+            return 2
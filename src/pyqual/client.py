@@ -1,29 +1,44 @@
+import csv
 import io
 import os
+import re
+import shutil
+import threading
 import time
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 import requests
-from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import HTTPError, Timeout
 
+from pyqual.cache import ExportCache
 from pyqual.constants import (
     BASE_URL,
+    CONTACT_IMPORT_BATCH_SIZE,
     ENDPOINTS,
     DATA_CENTERS,
     FILE_EXTENSION,
-    PAGE_SIZE
+    QUALTRICS_HEADER_ROWS,
+    SHARDABLE_FORMATS,
 )
+from pyqual.events import ExportEventListener
 from pyqual.exceptions import (
     ExportFailureError,
+    ExportTimeoutError,
     MissingApiTokenError,
     InvalidDataCenterError,
     MinimumSurveyCountError,
 )
+from pyqual.models import ContactImportReport, ResponseExportSpec, _format_qualtrics_datetime
+from pyqual.resilience import CircuitBreaker, HedgePolicy, RetryPolicy
+from pyqual.transport import TRANSPORTS, Transport
 
 
 def _extract_error_message(response: requests.Response | None) -> str:
@@ -54,21 +69,70 @@ def _extract_error_message(response: requests.Response | None) -> str:
     return f"HTTP status {status_code}"
 
 
-def _next_page_offset(next_page: str | None) -> int | None:
-    if not next_page or next_page == "null":
-        return None
+def _endpoint_pattern(template: str) -> re.Pattern:
+    parts = re.split(r'\{\d+\}', template.strip('/'))
+    return re.compile('[^/]+'.join(re.escape(part) for part in parts))
 
-    parsed_url = urlparse(next_page)
-    query_strings = parse_qs(parsed_url.query)
-    offsets = query_strings.get("offset")
-    if not offsets:
-        return None
 
-    try:
-        return int(offsets[-1])
-    except ValueError:
+_ENDPOINT_PATTERNS = {name: _endpoint_pattern(template) for name, template in ENDPOINTS.items()}
+
+
+def _endpoint_name(base_url: str, url: str) -> str:
+    """Return the ``ENDPOINTS`` name a URL belongs to, falling back to its path."""
+    path = urlparse(url).path
+    base_path = urlparse(base_url).path
+    if path.startswith(base_path):
+        path = path[len(base_path):]
+    path = path.strip('/')
+
+    for name, pattern in _ENDPOINT_PATTERNS.items():
+        if pattern.fullmatch(path):
+            return name
+    return path
+
+
+def _is_server_failure(response: requests.Response) -> bool:
+    status_code = getattr(response, 'status_code', None)
+    return isinstance(status_code, int) and (status_code >= 500 or status_code == requests.codes.too_many_requests)
+
+
+def _close_response(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _date_windows(start_date: datetime, end_date: datetime, shards: int) -> List[Tuple[str, str]]:
+    """Split ``[start_date, end_date)`` into up to ``shards`` contiguous windows of whole seconds."""
+    if shards < 1:
+        raise ValueError('shards must be at least 1')
+    if end_date <= start_date:
+        raise ValueError('end_date must be after start_date')
+
+    span = end_date - start_date
+    boundaries = [_format_qualtrics_datetime(start_date + span * index / shards) for index in range(shards)]
+    boundaries.append(_format_qualtrics_datetime(end_date))
+    boundaries = list(dict.fromkeys(boundaries))
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _next_page_params(next_page: str | None) -> Dict[str, Any] | None:
+    """Return the query parameters that fetch the page behind a ``nextPage`` URL.
+    Survey lists page with ``offset``, XM Directory lists with ``skipToken``.
+    """
+    if not next_page or next_page == "null":
         return None
 
+    query_strings = parse_qs(urlparse(next_page).query)
+    params: Dict[str, Any] = {}
+    if query_strings.get("skipToken"):
+        params["skipToken"] = query_strings["skipToken"][-1]
+    if query_strings.get("offset"):
+        try:
+            params["offset"] = int(query_strings["offset"][-1])
+        except ValueError:
+            return None
+    return params or None
+
 
 class BaseClient:
     """Base class.
@@ -89,9 +153,12 @@ class BaseClient:
             self,
             token: str = '',
             data_center: str = 'fra1',
-            retry: int = 3,
+            retry: int | RetryPolicy = 3,
             timeout: int = 10,
             stream: bool = True,
+            transport: str | type[Transport] = 'requests',
+            hedge: bool | HedgePolicy = False,
+            circuit_breaker: bool | CircuitBreaker = False,
     ):
         """Create instance of BaseClient.
         Parameters
@@ -100,10 +167,20 @@ class BaseClient:
              The secret Qualtrics access token.
         data_center: str
              The Qualtrics data center to connect to.
-        retry : int
-            Number of request retry attempts.
+        retry : int or RetryPolicy
+            Number of request retry attempts, or a policy controlling backoff,
+            retryable errors and the time budget.
         timeout : int
             Number of seconds before connection timeouts.
+        transport : str or Transport subclass
+            HTTP backend, either a class or one of the names in ``TRANSPORTS``
+            (``'requests'``, ``'urllib3'``, ``'httpx'``).
+        hedge : bool or HedgePolicy
+            Send a second copy of a slow progress poll and use whichever answers
+            first. ``True`` uses a default :class:`HedgePolicy`.
+        circuit_breaker : bool or CircuitBreaker
+            Fail fast on endpoints that keep failing. ``True`` uses a default
+            :class:`CircuitBreaker`.
 
         Returns
         -------
@@ -122,9 +199,21 @@ class BaseClient:
         self.token = token
         self.data_center = data_center
         self.retry = retry
+        self.retry_policy = retry if isinstance(retry, RetryPolicy) else RetryPolicy.from_int(retry)
         self.timeout = timeout
         self.stream = stream
-        self.session = self._get_session()
+
+        if isinstance(transport, str):
+            if transport not in TRANSPORTS:
+                raise ValueError(f'{transport} not a valid transport')
+            transport = TRANSPORTS[transport]
+        self._transport_class = transport
+        self.transport = self._get_transport()
+
+        self.hedge = HedgePolicy() if hedge is True else (hedge or None)
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else (circuit_breaker or None)
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
 
     @property
     def base_url(self) -> str:
@@ -145,18 +234,24 @@ class BaseClient:
             A client.
 
         """
+        if self.transport is None:
+            self.transport = self._get_transport()
         return self
 
     def __exit__(self, *args):
-        """Closes the session adapters.
+        """Closes the transport and its pooled connections.
         Returns
         -------
             None
 
         """
-        if self.session is not None:
-            self.session.close()
-            self.session = None
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        with self._hedge_lock:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
         return False
 
     def __str__(self):
@@ -179,29 +274,111 @@ class BaseClient:
         """
         return f'{self.__class__.__name__}()'
 
-    def _get_session(self) -> requests.Session:
-        """Return session that client uses for connecting to endpoint.
+    @property
+    def session(self) -> requests.Session | None:
+        """Return the ``requests`` session of the default transport, if any."""
+        return getattr(self.transport, 'session', None)
+
+    def _get_transport(self) -> Transport:
+        """Return transport that client uses for connecting to endpoint.
         Returns
         -------
-        class:`requests.Response`
-            Response object of requests library.
+        class:`pyqual.transport.Transport`
+            Transport sending the client's requests.
 
         """
-        session = requests.Session()
-
-        if self.token:
-            session.headers.update({"X-API-TOKEN": self.token})
-
-        if self.retry > 1:
-            adapter = HTTPAdapter(max_retries=self.retry)
-            session.mount(self.base_url, adapter)
-
-        return session
+        headers = {"X-API-TOKEN": self.token} if self.token else {}
+        return self._transport_class(headers=headers)
 
     def _build_url(self, endpoint: str) -> str:
         """Return a URL under the Qualtrics API base path."""
         return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
 
+    def _paginate(
+            self,
+            url: str,
+            params: Dict[str, Any] | None = None,
+            limit: int | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the elements of a paginated list endpoint.
+        While the elements of one page are consumed, the next page is already
+        being fetched in the background. Pages are followed through the
+        ``offset`` or ``skipToken`` of their ``nextPage`` until the last page or until ``limit`` elements
+        have been yielded, so stopping early never downloads the remainder.
+        Parameters
+        ----------
+        url: str
+             Full URL of the list endpoint.
+        params: dict
+            Query parameters sent with every page.
+        limit: int
+            Maximum number of elements to yield.
+        Returns
+        -------
+        iterator of dict
+            The ``result.elements`` of each page, in order.
+
+        """
+        def fetch_page(page_number: int, page_params: Dict[str, Any]) -> Dict[str, Any]:
+            page_params = {**(params or {}), **page_params}
+
+            print(f'Downloading page {page_number}.')
+            if page_params:
+                response = self._make_request(method='GET', url=url, params=page_params)
+            else:
+                response = self._make_request(method='GET', url=url)
+            return response.json()['result']
+
+        if limit is not None and limit <= 0:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page_number = 1
+            pending = executor.submit(fetch_page, page_number, {})
+            yielded = 0
+            while pending is not None:
+                result = pending.result()
+                elements = result.get('elements', ())
+
+                next_params = _next_page_params(result.get('nextPage'))
+                if next_params is not None and (limit is None or yielded + len(elements) < limit):
+                    page_number += 1
+                    pending = executor.submit(fetch_page, page_number, next_params)
+                else:
+                    pending = None
+
+                for element in elements:
+                    yield element
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _extract_export(content: bytes, output_dir: str | os.PathLike[str], file_name: str | None = None) -> Path:
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        root = output_path.resolve()
+
+        if not zipfile.is_zipfile(io.BytesIO(content)):
+            # Exports requested with compress=False arrive as the bare file.
+            if file_name is None:
+                raise ExportFailureError('Export is not a zip archive and no file name was given for it')
+            (root / Path(file_name).name).write_bytes(content)
+            return output_path
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            for member in archive.infolist():
+                target = (root / member.filename).resolve()
+                if target != root and root not in target.parents:
+                    raise ExportFailureError(f"Unsafe path in export archive: {member.filename}")
+
+            archive.extractall(root)
+
+        return output_path
+
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make a generic request.
         Parameters
@@ -216,20 +393,106 @@ class BaseClient:
             Response object of requests library.
 
         """
+        endpoint = f'{method} {_endpoint_name(self.base_url, url)}'
+        policy = self.retry_policy
+        started = time.monotonic()
+        retries = 0
+
+        while True:
+            try:
+                return self._send_request(endpoint, method, url, **kwargs)
+            except requests.RequestException as request_error:
+                delay = policy.next_delay(method, request_error, retries, time.monotonic() - started)
+                if delay is None:
+                    request_error.retries = retries
+                    if retries and request_error.args:
+                        request_error.args = (f'{request_error.args[0]} (after {retries} retries)',
+                                              *request_error.args[1:])
+                    raise
+
+            retries += 1
+            print(f'Retrying {method} {url} in {delay:.2f}s (retry {retries} of {policy.max_retries})')
+            policy.sleep(delay)
+
+    def _send_request(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a single attempt of a request, translating errors into readable exceptions."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(endpoint)
+
         try:
             kwargs.setdefault("stream", self.stream)
-            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            if self.hedge is not None and method == 'GET' and self.hedge.applies(endpoint):
+                response = self._send_hedged(endpoint, method, url, **kwargs)
+            else:
+                response = self.transport.request(method, url, timeout=self.timeout, **kwargs)
+            self._record_outcome(endpoint, response)
             response.raise_for_status()
         except HTTPError as http_error:
             error_msg = _extract_error_message(http_error.response)
-            raise HTTPError(f'HTTP error occurred. {error_msg}') from http_error
+            raise HTTPError(f'HTTP error occurred. {error_msg}', response=http_error.response) from http_error
         except RequestsConnectionError as connection_error:
-            raise RequestsConnectionError(f'Could not establish connection to {url}. Reason {connection_error}')
+            self._record_outcome(endpoint, None)
+            raise type(connection_error)(
+                f'Could not establish connection to {url}. Reason {connection_error}'
+            ) from connection_error
         except Timeout as timeout_error:
-            raise Timeout(f'Failed to receive response from {url}. Reason {timeout_error}')
+            self._record_outcome(endpoint, None)
+            raise type(timeout_error)(
+                f'Failed to receive response from {url}. Reason {timeout_error}'
+            ) from timeout_error
+        except requests.RequestException:
+            self._record_outcome(endpoint, None)
+            raise
         else:
             return response
 
+    def _record_outcome(self, endpoint: str, response: requests.Response | None) -> None:
+        if self.circuit_breaker is None:
+            return
+
+        if response is None or _is_server_failure(response):
+            self.circuit_breaker.record_failure(endpoint)
+        else:
+            self.circuit_breaker.record_success(endpoint)
+
+    def _send_hedged(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, duplicating it if it outlasts the endpoint's hedge delay."""
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.hedge.max_workers, thread_name_prefix='pyqual-hedge'
+                )
+        executor = self._hedge_executor
+
+        started = time.perf_counter()
+        delay = self.hedge.delay(endpoint)
+        primary = executor.submit(self.transport.request, method, url, timeout=self.timeout, **kwargs)
+        # Only the primary's own latency, success or failure, feeds the hedge delay; recording the
+        # winner instead would let hedged responses drag the percentile down and hedge ever more.
+        primary.add_done_callback(lambda future: self.hedge.record(endpoint, time.perf_counter() - started))
+        pending = {primary}
+
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done:
+                pending.add(executor.submit(self.transport.request, method, url, timeout=self.timeout, **kwargs))
+
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.RequestException as request_error:
+                    error = request_error
+                    continue
+
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return response
+
+        raise error
+
 
 class QualtricsResponseExportClient(BaseClient):
 
@@ -270,7 +533,11 @@ class QualtricsResponseExportClient(BaseClient):
         """
         service_url = ENDPOINTS.get('export').format(survey_id)
         full_url = self._build_url(service_url)
+        data = self._export_payload(file_format, filter_id, body)
+        return self._make_request('POST', url=full_url, json=data)
 
+    @staticmethod
+    def _export_payload(file_format: str, filter_id: str = None, body: Dict[str, Any] = None) -> Dict[str, Any]:
         if file_format not in FILE_EXTENSION:
             raise ValueError('Unsupported file format')
 
@@ -281,7 +548,14 @@ class QualtricsResponseExportClient(BaseClient):
         if body is not None:
             data.update((key, value) for key, value in body.items() if key not in data)
 
-        return self._make_request('POST', url=full_url, json=data)
+        return data
+
+    def get_survey_last_modified(self, survey_id: str) -> str:
+        """Return the ``lastModified`` timestamp of a survey."""
+        service_url = ENDPOINTS.get('get_survey').format(survey_id)
+        full_url = self._build_url(service_url)
+        result = self._make_request(method='GET', url=full_url).json()['result']
+        return result.get('lastModified') or result['lastModifiedDate']
 
     def get_response_export_progress(self, survey_id: str, progress_id: str) -> requests.Response:
         """Get the progress for a response export job."""
@@ -295,102 +569,420 @@ class QualtricsResponseExportClient(BaseClient):
         full_url = self._build_url(service_url)
         return self._make_request('GET', url=full_url)
 
-    def export_survey(
+    def create_event_subscription(self, topics: str, publication_url: str, encrypt: bool = False) -> requests.Response:
+        """Subscribe ``publication_url`` to Qualtrics events.
+        Parameters
+        ----------
+        topics: str
+             The event topic, e.g. ``surveyengine.completedResponse.{survey_id}``.
+        publication_url: str
+            Where Qualtrics posts the events, typically an :class:`ExportEventListener` url.
+        encrypt: bool
+            Whether Qualtrics encrypts the event messages.
+        Returns
+        -------
+        class:`requests.Response`
+            Response object of requests library.
+
+        """
+        service_url = ENDPOINTS.get('event_subscriptions')
+        full_url = self._build_url(service_url)
+        data = {'topics': topics, 'publicationUrl': publication_url, 'encrypt': encrypt}
+        return self._make_request('POST', url=full_url, json=data)
+
+    def delete_event_subscription(self, subscription_id: str) -> requests.Response:
+        """Remove an event subscription."""
+        service_url = ENDPOINTS.get('event_subscription').format(subscription_id)
+        full_url = self._build_url(service_url)
+        return self._make_request('DELETE', url=full_url)
+
+    def wait_for_export(
             self,
             survey_id: str,
-            file_format: str,
-            filter_id: str = None,
-            body: Dict[str, Any] = None,
-            output_dir: str | os.PathLike[str] = "MyQualtricsDownload",
+            progress_id: str,
             max_polls: int = 120,
             poll_interval: float = 1.0,
-    ) -> Path:
+            listener: ExportEventListener | None = None,
+    ) -> str:
+        """Poll a response export job until it completes.
+        Parameters
+        ----------
+        survey_id: str
+             The id for the survey.
+        progress_id: str
+            The id of the export job returned by :meth:`start_response_export`.
+        max_polls: int
+            Number of progress checks before giving up.
+        poll_interval: float
+            Seconds to wait between progress checks.
+        listener: ExportEventListener
+            When given, the next progress check waits for a callback, or for
+            the listener's ``fallback_interval``, but never comes sooner than
+            ``poll_interval`` after the last one. The export then gives up
+            after ``max_polls * poll_interval`` seconds rather than after
+            ``max_polls`` checks.
+        Returns
+        -------
+        str
+            The id of the file holding the finished export.
 
-        export_response = self.start_response_export(survey_id, file_format, filter_id, body=body)
-        progress_id = export_response.json()["result"]["progressId"]
+        """
+        if listener is not None:
+            return self._wait_for_export_notified(
+                survey_id, progress_id, max_polls * poll_interval, poll_interval, listener
+            )
 
         for _ in range(max_polls):
-            check_response = self.get_response_export_progress(survey_id, progress_id)
-            result = check_response.json()["result"]
-            progress_status = result["status"]
-            request_progress = result.get("percentComplete")
+            file_id = self._check_export(survey_id, progress_id)
+            if file_id is not None:
+                return file_id
+            time.sleep(poll_interval)
 
-            if request_progress is not None:
-                print("Download is " + str(request_progress) + "% complete")
+        raise ExportTimeoutError(f"Export did not complete after {max_polls} checks")
 
-            if progress_status == "failed":
-                raise ExportFailureError("Export failed")
+    def _check_export(self, survey_id: str, progress_id: str) -> str | None:
+        check_response = self.get_response_export_progress(survey_id, progress_id)
+        result = check_response.json()["result"]
+        progress_status = result["status"]
+        request_progress = result.get("percentComplete")
 
-            if progress_status == "complete":
-                file_id = result["fileId"]
-                download_response = self.get_response_export_file(survey_id, file_id)
-                output_path = self._extract_export(download_response.content, output_dir)
-                print('Download complete')
-                return output_path
+        if request_progress is not None:
+            print("Download is " + str(request_progress) + "% complete")
 
-            time.sleep(poll_interval)
+        if progress_status == "failed":
+            raise ExportFailureError("Export failed")
 
-        raise ExportFailureError(f"Export did not complete after {max_polls} checks")
+        if progress_status == "complete":
+            return result["fileId"]
+        return None
 
-    @staticmethod
-    def _extract_export(content: bytes, output_dir: str | os.PathLike[str]) -> Path:
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        root = output_path.resolve()
+    def _wait_for_export_notified(
+            self,
+            survey_id: str,
+            progress_id: str,
+            timeout: float,
+            min_interval: float,
+            listener: ExportEventListener,
+    ) -> str:
+        deadline = time.monotonic() + timeout
+        while True:
+            generation = listener.generation(survey_id, progress_id)
+            checked_at = time.monotonic()
+            file_id = self._check_export(survey_id, progress_id)
+            if file_id is not None:
+                return file_id
 
-        with zipfile.ZipFile(io.BytesIO(content)) as archive:
-            for member in archive.infolist():
-                target = (root / member.filename).resolve()
-                if target != root and root not in target.parents:
-                    raise ExportFailureError(f"Unsafe path in export archive: {member.filename}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ExportTimeoutError(f"Export did not complete within {timeout:g} seconds")
 
-            archive.extractall(root)
+            listener.wait(survey_id, progress_id, timeout=min(listener.fallback_interval, remaining), since=generation)
+            # Callbacks are only hints and may arrive in bursts; keep checks at least min_interval apart.
+            time.sleep(max(0.0, min(checked_at + min_interval, deadline) - time.monotonic()))
 
+    def download_export(
+            self,
+            survey_id: str,
+            file_id: str,
+            output_dir: str | os.PathLike[str] = "MyQualtricsDownload",
+            file_format: str | None = None,
+    ) -> Path:
+        """Download a finished response export and extract it into ``output_dir``.
+        An uncompressed export is saved as ``<survey_id>.<file_format>``.
+        """
+        download_response = self.get_response_export_file(survey_id, file_id)
+        file_name = None if file_format is None else f'{survey_id}.{file_format}'
+        output_path = self._extract_export(download_response.content, output_dir, file_name=file_name)
+        print('Download complete')
         return output_path
 
+    def export_survey(
+            self,
+            survey_id: str,
+            file_format: str,
+            filter_id: str = None,
+            body: Dict[str, Any] = None,
+            output_dir: str | os.PathLike[str] = "MyQualtricsDownload",
+            max_polls: int = 120,
+            poll_interval: float = 1.0,
+            cache: ExportCache | None = None,
+            spec: ResponseExportSpec | None = None,
+            listener: ExportEventListener | None = None,
+    ) -> Path:
+        """Export a survey's responses and extract them into ``output_dir``.
+        Parameters
+        ----------
+        survey_id: str
+             The id for the survey.
+        file_format: str
+            The file format for data export.
+        filter_id: str
+            The survey filter id.
+        body: dict
+            Optional fields to modify the export.
+        output_dir: str or path-like
+            Directory the export archive is extracted into.
+        max_polls: int
+            Number of progress checks before giving up.
+        poll_interval: float
+            Seconds to wait between progress checks.
+        cache: ExportCache
+            When given, an identical earlier export of the unchanged survey is
+            reused instead of starting a new Qualtrics job.
+        spec: ResponseExportSpec
+            Columns and responses to export; explicit ``filter_id`` and
+            ``body`` entries take precedence over it.
+        listener: ExportEventListener
+            Wake on completion callbacks instead of polling every ``poll_interval``.
+        Returns
+        -------
+        class:`pathlib.Path`
+            The directory holding the extracted export.
 
-class QualtricsManageSurveyClient(BaseClient):
-
-    def get_all_surveys(self, limit: int = 500) -> List[Dict[str, Any]]:
-        if limit < 100:
-            raise MinimumSurveyCountError('Limit must be no less than 100')
+        """
+        if spec is not None:
+            body = {**spec.to_body(), **(body or {})}
+            filter_id = filter_id if filter_id is not None else spec.filter_id
 
-        service_url = ENDPOINTS.get('surveys')
-        full_url = self._build_url(service_url)
+        if cache is None:
+            content = self._run_export(survey_id, file_format, filter_id, body, max_polls, poll_interval, listener)
+        else:
+            payload = self._export_payload(file_format, filter_id, body)
+            key = cache.key(survey_id, self.get_survey_last_modified(survey_id), payload)
+
+            with cache.lock(key):
+                content = cache.get(key)
+                if content is None:
+                    content = self._run_export(
+                        survey_id, file_format, filter_id, body, max_polls, poll_interval, listener
+                    )
+                    cache.put(key, content)
+                else:
+                    print(f'Using cached export of survey {survey_id}')
+
+        output_path = self._extract_export(content, output_dir, file_name=f'{survey_id}.{file_format}')
+        print('Download complete')
+        return output_path
 
-        print(f'Downloading page 1.')
-        response = self._make_request(method='GET', url=full_url)
-        json_response = response.json()
+    def export_survey_sharded(
+            self,
+            survey_id: str,
+            file_format: str,
+            start_date: datetime,
+            end_date: datetime,
+            shards: int = 4,
+            filter_id: str = None,
+            body: Dict[str, Any] = None,
+            output_dir: str | os.PathLike[str] = "MyQualtricsDownload",
+            max_workers: int = None,
+            max_attempts: int = 3,
+            max_polls: int = 120,
+            poll_interval: float = 1.0,
+            listener: ExportEventListener | None = None,
+    ) -> Path:
+        """Export a large survey as several concurrent jobs, one per recorded-date window.
+        The range ``[start_date, end_date)`` is split into ``shards`` contiguous
+        windows passed as the export's ``startDate`` (inclusive) and ``endDate``
+        (exclusive). Shards run concurrently; only the shards that fail are run
+        again, up to ``max_attempts`` times. The shard files are then merged in
+        date order into a single file with one set of header rows.
+        Parameters
+        ----------
+        survey_id: str
+             The id for the survey.
+        file_format: str
+            ``csv`` or ``ndjson``, the formats whose shards can be concatenated.
+        start_date: datetime
+            Start of the first window; naive datetimes are taken as UTC.
+        end_date: datetime
+            End of the last window.
+        shards: int
+            Number of windows.
+        filter_id: str
+            The survey filter id.
+        body: dict
+            Optional fields to modify every shard's export.
+        output_dir: str or path-like
+            Directory receiving the merged file.
+        max_workers: int
+            Shards exported at once; defaults to ``shards``.
+        max_attempts: int
+            Attempts per shard before giving up.
+        Returns
+        -------
+        class:`pathlib.Path`
+            The merged export file.
 
-        survey_list = []
-        survey_list.extend(json_response['result']['elements'])
+        """
+        if file_format not in SHARDABLE_FORMATS:
+            raise ValueError(f'Sharded exports support {", ".join(SHARDABLE_FORMATS)}, not {file_format}')
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if body and ('startDate' in body or 'endDate' in body):
+            raise ValueError('startDate and endDate are set per shard; pass start_date and end_date instead')
+
+        windows = _date_windows(start_date, end_date, shards)
+        output_path = Path(output_dir)
+        shard_dir = output_path / f'.{survey_id}-shards'
+        shard_dir.mkdir(parents=True, exist_ok=True)
+
+        def export_shard(index: int) -> Path:
+            window_start, window_end = windows[index]
+            shard_body = {**(body or {}), 'startDate': window_start, 'endDate': window_end}
+            content = self._run_export(
+                survey_id, file_format, filter_id, shard_body, max_polls, poll_interval, listener
+            )
+            shard_path = shard_dir / f'{index:05d}.part'
+            shard_path.write_bytes(content)
+            return shard_path
 
-        if len(survey_list) >= limit:
-            return survey_list[:limit]
+        try:
+            shard_paths: Dict[int, Path] = {}
+            errors: Dict[int, Exception] = {}
+            pending = list(range(len(windows)))
+            with ThreadPoolExecutor(max_workers=max_workers or len(windows)) as executor:
+                for attempt in range(1, max_attempts + 1):
+                    print(f'Exporting {len(pending)} of {len(windows)} shards (attempt {attempt})')
+                    futures = {executor.submit(export_shard, index): index for index in pending}
+                    errors = {}
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        try:
+                            shard_paths[index] = future.result()
+                        except (ExportFailureError, requests.RequestException) as shard_error:
+                            errors[index] = shard_error
+
+                    pending = sorted(errors)
+                    if not pending:
+                        break
+
+            if errors:
+                details = '; '.join(f'{windows[index][0]}..{windows[index][1]}: {errors[index]}' for index in pending)
+                raise ExportFailureError(f'{len(pending)} shard(s) failed after {max_attempts} attempts: {details}')
+
+            merged_path = output_path / f'{survey_id}.{file_format}'
+            self._merge_shards([shard_paths[index] for index in range(len(windows))], merged_path, file_format)
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+        print('Download complete')
+        return merged_path
 
-        while True:
-            offset = _next_page_offset(json_response['result'].get('nextPage'))
-            if offset is None or offset >= limit:
-                break
+    @staticmethod
+    def _merge_shards(shards: List[Path], merged_path: Path, file_format: str) -> None:
+        suffix = f'.{file_format}'
+
+        @contextmanager
+        def open_shard(shard_path: Path) -> Iterator[IO[bytes]]:
+            if not zipfile.is_zipfile(shard_path):
+                # Shards of an export with compress=False hold the bare file.
+                with open(shard_path, 'rb') as raw:
+                    yield raw
+                return
+
+            with zipfile.ZipFile(shard_path) as archive:
+                members = [name for name in archive.namelist() if name.lower().endswith(suffix)]
+                if len(members) != 1:
+                    raise ExportFailureError(f'Expected one {suffix} file in shard archive, found {len(members)}')
+                with archive.open(members[0]) as member:
+                    yield member
+
+        if file_format == 'ndjson':
+            with open(merged_path, 'wb') as merged:
+                for shard_path in shards:
+                    with open_shard(shard_path) as member:
+                        last = b'\n'
+                        while chunk := member.read(1024 * 1024):
+                            merged.write(chunk)
+                            last = chunk[-1:]
+                        if last != b'\n':
+                            merged.write(b'\n')
+            return
+
+        with open(merged_path, 'w', encoding='utf-8-sig', newline='') as merged:
+            writer = csv.writer(merged)
+            for shard_index, shard_path in enumerate(shards):
+                with open_shard(shard_path) as member:
+                    reader = csv.reader(io.TextIOWrapper(member, encoding='utf-8-sig', newline=''))
+                    for row_index, row in enumerate(reader):
+                        if shard_index and row_index < QUALTRICS_HEADER_ROWS:
+                            continue
+                        writer.writerow(row)
+
+    def _run_export(
+            self,
+            survey_id: str,
+            file_format: str,
+            filter_id: str | None,
+            body: Dict[str, Any] | None,
+            max_polls: int,
+            poll_interval: float,
+            listener: ExportEventListener | None = None,
+    ) -> bytes:
+        export_response = self.start_response_export(survey_id, file_format, filter_id, body=body)
+        progress_id = export_response.json()["result"]["progressId"]
+        file_id = self.wait_for_export(
+            survey_id, progress_id, max_polls=max_polls, poll_interval=poll_interval, listener=listener
+        )
+        return self.get_response_export_file(survey_id, file_id).content
 
-            page = (offset // PAGE_SIZE) + 1
-            print(f'Downloading page {page}.')
 
-            response = self._make_request(method='GET', url=full_url, params={'offset': offset})
-            json_response = response.json()
+class QualtricsManageSurveyClient(BaseClient):
 
-            survey_list.extend(json_response['result']['elements'])
+    def get_all_surveys(self, limit: int = 500) -> List[Dict[str, Any]]:
+        if limit < 100:
+            raise MinimumSurveyCountError('Limit must be no less than 100')
 
-            if len(survey_list) >= limit:
-                return survey_list[:limit]
+        return list(self.iter_all_surveys(limit=limit))
 
-        return survey_list
+    def iter_all_surveys(self, limit: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the surveys available to the account, page by page."""
+        service_url = ENDPOINTS.get('surveys')
+        full_url = self._build_url(service_url)
+        return self._paginate(full_url, limit=limit)
 
     def get_survey(self, survey_id: str) -> requests.Response:
         service_url = ENDPOINTS.get('get_survey').format(survey_id)
         full_url = self._build_url(service_url)
         return self._make_request(method='GET', url=full_url)
 
+    def get_surveys(
+            self,
+            survey_ids: Iterable[str],
+            max_workers: int = 8,
+    ) -> Iterator[Tuple[str, requests.Response | requests.RequestException]]:
+        """Fetch several survey definitions concurrently.
+        Parameters
+        ----------
+        survey_ids: iterable of str
+             The ids of the surveys to fetch.
+        max_workers: int
+            Maximum number of requests in flight at any time.
+        Returns
+        -------
+        iterator of (str, class:`requests.Response` or exception)
+            Survey id paired with its response, or with the request error,
+            yielded in the order the requests finish.
+
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(self.get_survey, survey_id): survey_id
+                for survey_id in dict.fromkeys(survey_ids)
+            }
+            for future in as_completed(futures):
+                survey_id = futures[future]
+                try:
+                    yield survey_id, future.result()
+                except requests.RequestException as request_error:
+                    yield survey_id, request_error
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def deactivate_survey(self, survey_id: str) -> requests.Response:
         service_url = ENDPOINTS.get('get_survey').format(survey_id)
         full_url = self._build_url(service_url)
@@ -422,6 +1014,12 @@ class QualtricsManageSurveyClient(BaseClient):
         full_url = self._build_url(service_url)
         return self._make_request(method='GET', url=full_url)
 
+    def iter_directories(self, limit: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the directories available to the account, page by page."""
+        service_url = ENDPOINTS.get('directories')
+        full_url = self._build_url(service_url)
+        return self._paginate(full_url, limit=limit)
+
     def delete_survey(self, survey_id: str) -> requests.Response:
         service_url = ENDPOINTS.get('get_survey').format(survey_id)
         full_url = self._build_url(service_url)
@@ -433,3 +1031,181 @@ class QualtricsManageSurveyClient(BaseClient):
             print('Survey deleted.')
 
         return response
+
+
+class QualtricsDirectoryClient(BaseClient):
+
+    def get_mailing_lists(self, directory_id: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the mailing lists of a directory."""
+        service_url = ENDPOINTS.get('mailing_lists').format(directory_id)
+        full_url = self._build_url(service_url)
+        return self._paginate(full_url)
+
+    def start_contact_import(
+            self,
+            directory_id: str,
+            mailing_list_id: str,
+            contacts: List[Dict[str, Any]],
+    ) -> requests.Response:
+        """Start an asynchronous import of contacts into a mailing list.
+        Parameters
+        ----------
+        directory_id: str
+             The id for the directory (``POOL_...``).
+        mailing_list_id: str
+            The id for the mailing list (``CG_...``).
+        contacts: list of dict
+            Contacts in the Qualtrics contact format (``firstName``, ``email``, ``embeddedData``, ...).
+        Returns
+        -------
+        class:`requests.Response`
+            Response object of requests library.
+
+        """
+        service_url = ENDPOINTS.get('contact_import').format(directory_id, mailing_list_id)
+        full_url = self._build_url(service_url)
+        return self._make_request('POST', url=full_url, json={'contacts': contacts})
+
+    def get_contact_import_progress(self, directory_id: str, mailing_list_id: str, import_id: str) -> requests.Response:
+        """Get the progress for a contact import job."""
+        service_url = ENDPOINTS.get('contact_import_progress').format(directory_id, mailing_list_id, import_id)
+        full_url = self._build_url(service_url)
+        return self._make_request('GET', url=full_url)
+
+    def get_contact_import_summary(self, directory_id: str, mailing_list_id: str, import_id: str) -> requests.Response:
+        """Get the per-contact outcome of a finished contact import job."""
+        service_url = ENDPOINTS.get('contact_import_summary').format(directory_id, mailing_list_id, import_id)
+        full_url = self._build_url(service_url)
+        return self._make_request('GET', url=full_url)
+
+    def import_contacts(
+            self,
+            directory_id: str,
+            mailing_list_id: str,
+            contacts: Iterable[Dict[str, Any]],
+            batch_size: int = CONTACT_IMPORT_BATCH_SIZE,
+            max_polls: int = 120,
+            poll_interval: float = 1.0,
+    ) -> List[ContactImportReport]:
+        """Import contacts from any iterable in bounded batches.
+        Only one batch is held in memory at a time. A failing batch is recorded
+        in its report and does not stop the batches after it.
+        Parameters
+        ----------
+        directory_id: str
+             The id for the directory.
+        mailing_list_id: str
+            The id for the mailing list.
+        contacts: iterable of dict
+            Contacts to import, consumed lazily.
+        batch_size: int
+            Maximum number of contacts sent in one import job.
+        max_polls: int
+            Number of progress checks per batch before giving up.
+        poll_interval: float
+            Seconds to wait between progress checks.
+        Returns
+        -------
+        list of ContactImportReport
+            One report per batch, in order.
+
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+
+        reports = []
+        contacts = iter(contacts)
+        while batch := list(islice(contacts, batch_size)):
+            report = ContactImportReport(batch_index=len(reports), contact_count=len(batch))
+            reports.append(report)
+            print(f'Importing batch {report.batch_index + 1} with {len(batch)} contacts')
+
+            try:
+                response = self.start_contact_import(directory_id, mailing_list_id, batch)
+                report.import_id = response.json()['result']['id']
+
+                import_id = report.import_id
+                self._wait_for_job(
+                    lambda: self.get_contact_import_progress(directory_id, mailing_list_id, import_id),
+                    max_polls,
+                    poll_interval,
+                )
+
+                summary = self.get_contact_import_summary(directory_id, mailing_list_id, report.import_id)
+                report.apply_summary(summary.json()['result'])
+                report.status = 'complete'
+            except (ExportFailureError, requests.RequestException, KeyError) as batch_error:
+                report.status = 'failed'
+                report.error = str(batch_error)
+
+        return reports
+
+    def start_contact_export(self, directory_id: str, mailing_list_id: str = None) -> requests.Response:
+        """Start an asynchronous export of a directory's contacts, optionally limited to one mailing list."""
+        service_url = ENDPOINTS.get('contact_export').format(directory_id)
+        full_url = self._build_url(service_url)
+
+        data = {}
+        if mailing_list_id is not None:
+            data['mailingListId'] = mailing_list_id
+
+        return self._make_request('POST', url=full_url, json=data)
+
+    def get_contact_export_progress(self, directory_id: str, export_id: str) -> requests.Response:
+        """Get the progress for a contact export job."""
+        service_url = ENDPOINTS.get('contact_export_progress').format(directory_id, export_id)
+        full_url = self._build_url(service_url)
+        return self._make_request('GET', url=full_url)
+
+    def get_contact_export_file(self, directory_id: str, file_id: str) -> requests.Response:
+        """Download the completed contact export file named by the ``fileId`` of its progress."""
+        service_url = ENDPOINTS.get('contact_export_file').format(directory_id, file_id)
+        full_url = self._build_url(service_url)
+        return self._make_request('GET', url=full_url)
+
+    def export_contacts(
+            self,
+            directory_id: str,
+            mailing_list_id: str = None,
+            output_dir: str | os.PathLike[str] = "MyQualtricsDownload",
+            max_polls: int = 120,
+            poll_interval: float = 1.0,
+    ) -> Path:
+        """Export the contacts of a directory or mailing list and extract them into ``output_dir``."""
+        response = self.start_contact_export(directory_id, mailing_list_id)
+        export_id = response.json()['result']['id']
+
+        result = self._wait_for_job(
+            lambda: self.get_contact_export_progress(directory_id, export_id),
+            max_polls,
+            poll_interval,
+        )
+
+        download_response = self.get_contact_export_file(directory_id, result['fileId'])
+        output_path = self._extract_export(download_response.content, output_dir)
+        print('Download complete')
+        return output_path
+
+    @staticmethod
+    def _wait_for_job(
+            check_progress: Callable[[], requests.Response],
+            max_polls: int,
+            poll_interval: float,
+    ) -> Dict[str, Any]:
+        for _ in range(max_polls):
+            result = check_progress().json()['result']
+            status = str(result.get('status', '')).lower()
+            request_progress = result.get('percentComplete')
+
+            if request_progress is not None:
+                print("Job is " + str(request_progress) + "% complete")
+
+            if status == 'failed':
+                raise ExportFailureError('Directory job failed')
+
+            if status == 'complete':
+                return result
+
+            time.sleep(poll_interval)
+
+        raise ExportTimeoutError(f"Directory job did not complete after {max_polls} checks")
@@ -7,6 +7,15 @@ ENDPOINTS = {
     'surveys': 'surveys',
     'get_survey': 'surveys/{0}',
     'directories': 'directories',
+    'mailing_lists': 'directories/{0}/mailinglists',
+    'contact_import': 'directories/{0}/mailinglists/{1}/contactimports',
+    'contact_import_progress': 'directories/{0}/mailinglists/{1}/contactimports/{2}',
+    'contact_import_summary': 'directories/{0}/mailinglists/{1}/contactimports/{2}/summary',
+    'contact_export': 'directories/{0}/exportcontacts',
+    'contact_export_progress': 'directories/{0}/exportcontacts/{1}',
+    'contact_export_file': 'directories/{0}/exportcontacts/{1}/file',
+    'event_subscriptions': 'eventsubscriptions/',
+    'event_subscription': 'eventsubscriptions/{0}',
 }
 DATA_CENTERS = [
     'fra1',
@@ -25,3 +34,26 @@ FILE_EXTENSION = [
     'spss'
 ]
 PAGE_SIZE = 100
+CONTACT_IMPORT_BATCH_SIZE = 1000
+# Qualtrics CSV exports carry three header rows: column names, question text and import ids.
+QUALTRICS_HEADER_ROWS = 3
+SHARDABLE_FORMATS = ('csv', 'ndjson')
+SURVEY_METADATA_IDS = (
+    'startDate',
+    'endDate',
+    'status',
+    'ipAddress',
+    'progress',
+    'duration',
+    'finished',
+    'recordedDate',
+    '_recordId',
+    'recipientLastName',
+    'recipientFirstName',
+    'recipientEmail',
+    'externalDataReference',
+    'locationLatitude',
+    'locationLongitude',
+    'distributionChannel',
+    'userLanguage',
+)
@@ -0,0 +1,192 @@
+"""Wake waiting exports from Qualtrics event-subscription callbacks.
+
+Qualtrics posts event notifications as form fields ``Topic`` and ``MSG``, the
+latter a JSON object. :class:`ExportEventListener` receives them on a local
+HTTP server and wakes the export waiting for the progress id (or, failing
+that, the survey id) the message names. A notification is only a hint: the
+waiting export still confirms completion with one progress check, and falls
+back to slow polling when no notification arrives.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Mapping
+from urllib.parse import parse_qs
+
+PROGRESS_ID_FIELDS = ('progressId', 'ProgressID', 'exportProgressId')
+SURVEY_ID_FIELDS = ('surveyId', 'SurveyID')
+
+
+def _parse_callback(body: bytes, content_type: str) -> Dict[str, Any]:
+    if content_type.startswith('application/json'):
+        message = json.loads(body or b'{}')
+        return message if isinstance(message, dict) else {}
+
+    fields = {name: values[-1] for name, values in parse_qs(body.decode('utf-8')).items()}
+    message: Dict[str, Any] = {'Topic': fields.get('Topic')}
+    try:
+        payload = json.loads(fields.get('MSG') or '{}')
+    except ValueError:
+        payload = {}
+    if isinstance(payload, dict):
+        message.update(payload)
+    return message
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        try:
+            message = _parse_callback(body, self.headers.get('Content-Type') or '')
+        except (UnicodeDecodeError, ValueError):
+            self.send_response(400)
+        else:
+            self.server.listener.notify(message)
+            self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class ExportEventListener:
+    """Local HTTP endpoint for Qualtrics event-subscription callbacks.
+
+    Register :attr:`url` (or ``public_url`` when the listener sits behind a
+    tunnel or proxy) with
+    :meth:`QualtricsResponseExportClient.create_event_subscription`, then pass
+    the listener to ``wait_for_export``, ``export_survey`` or the
+    :class:`~pyqual.scheduler.ExportScheduler`.
+
+    Parameters
+    ----------
+        host: str
+            Interface the server binds to.
+        port: int
+            Port the server binds to; ``0`` picks a free one.
+        public_url: str
+            Address Qualtrics should post to, if it differs from the local one.
+        fallback_interval: float
+            Seconds a waiting export goes without a notification before it
+            checks the progress anyway.
+    """
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            public_url: str | None = None,
+            fallback_interval: float = 30.0,
+    ) -> None:
+        if fallback_interval <= 0:
+            raise ValueError('fallback_interval must be positive')
+
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.fallback_interval = fallback_interval
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._generations: Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(url={self.url!r})'
+
+    def __enter__(self) -> ExportEventListener:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> bool:
+        self.close()
+        return False
+
+    @property
+    def url(self) -> str:
+        if self.public_url is not None:
+            return self.public_url
+        return f'http://{self.host}:{self.port}/'
+
+    def start(self) -> None:
+        if self._server is not None:
+            return
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _CallbackHandler)
+        self._server.daemon_threads = True
+        self._server.listener = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.1}, name='pyqual-events', daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def notify(self, message: Mapping[str, Any]) -> None:
+        """Wake the exports a callback message refers to."""
+        keys = {f'progress:{message[name]}' for name in PROGRESS_ID_FIELDS if message.get(name)}
+        if not keys:
+            keys = {f'survey:{message[name]}' for name in SURVEY_ID_FIELDS if message.get(name)}
+        if not keys:
+            return
+
+        with self._condition:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._condition.notify_all()
+
+    def _generation(self, survey_id: str, progress_id: str) -> int:
+        return self._generations.get(f'progress:{progress_id}', 0) + self._generations.get(f'survey:{survey_id}', 0)
+
+    def generation(self, survey_id: str, progress_id: str) -> int:
+        """Return a marker of the notifications seen so far for the export, to pass to :meth:`wait`."""
+        with self._condition:
+            return self._generation(survey_id, progress_id)
+
+    def wait(
+            self,
+            survey_id: str,
+            progress_id: str,
+            timeout: float | None = None,
+            since: int | None = None,
+    ) -> bool:
+        """Block until a notification for the export arrives or ``timeout`` passes.
+        Every waiter of the export (or of its survey) is woken by the same notification.
+        Parameters
+        ----------
+        survey_id: str
+             The id for the survey.
+        progress_id: str
+            The id of the export job.
+        timeout: float
+            Seconds to wait at most; defaults to ``fallback_interval``.
+        since: int
+            A :meth:`generation` taken earlier; notifications that arrived after
+            it return immediately. Defaults to the current generation.
+        Returns
+        -------
+        bool
+            Whether a notification arrived.
+
+        """
+        with self._condition:
+            if since is None:
+                since = self._generation(survey_id, progress_id)
+            return self._condition.wait_for(
+                lambda: self._generation(survey_id, progress_id) > since,
+                self.fallback_interval if timeout is None else timeout,
+            )
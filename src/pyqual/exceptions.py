@@ -1,3 +1,6 @@
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+
 class InputError(Exception):
     """Is raised when an input if wrong."""
     pass
@@ -18,6 +21,16 @@ class ExportFailureError(Exception):
     pass
 
 
+class ExportTimeoutError(ExportFailureError):
+    """Is raised when an export is still running after the last progress check."""
+    pass
+
+
 class MinimumSurveyCountError(Exception):
     """Is Raised if Limit for downloaded surveys id too low"""
     pass
+
+
+class CircuitOpenError(RequestsConnectionError):
+    """Is raised when requests to an endpoint are suspended after repeated failures."""
+    pass
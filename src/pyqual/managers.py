@@ -1,10 +1,10 @@
 import os
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 import requests
 
 from pyqual.client import QualtricsManageSurveyClient
-from pyqual.models import QualtricsSurvey
+from pyqual.models import QualtricsSurvey, SurveyDefinition
 
 
 class BaseManager:
@@ -65,6 +65,40 @@ class QualtricsManager(BaseManager):
 
             return QualtricsSurvey.from_dict(data)
 
+    def retrieve_survey_definition(self, survey_id: str) -> SurveyDefinition:
+        """Retrieve the full definition (questions, blocks, flow) of a single survey."""
+        with self._client as client:
+            print(f"Retrieving definition of Survey with id {survey_id}")
+            response = client.get_survey(survey_id=survey_id)
+            return SurveyDefinition.from_dict(response.json()['result'])
+
+    def iter_surveys(
+            self,
+            survey_ids: Iterable[str],
+            max_workers: int = 8,
+    ) -> Iterator[Tuple[str, QualtricsSurvey | Exception]]:
+        """Retrieve several surveys concurrently, yielding each as soon as it arrives."""
+        with self._client as client:
+            for survey_id, response in client.get_surveys(survey_ids, max_workers=max_workers):
+                if isinstance(response, Exception):
+                    yield survey_id, response
+                    continue
+
+                try:
+                    yield survey_id, QualtricsSurvey.from_dict(response.json()['result'])
+                except (KeyError, TypeError, ValueError) as parse_error:
+                    yield survey_id, parse_error
+
+    def retrieve_surveys(
+            self,
+            survey_ids: Iterable[str],
+            max_workers: int = 8,
+    ) -> Dict[str, QualtricsSurvey | Exception]:
+        """Retrieve several surveys, mapping each id to its survey or the error raised fetching it."""
+        survey_ids = list(survey_ids)
+        print(f"Retrieving {len(survey_ids)} Surveys")
+        return dict(self.iter_surveys(survey_ids, max_workers=max_workers))
+
     def deactivate_survey(self, survey_id: str) -> requests.Response:
         """Deactivate a survey."""
         with self._client as client:
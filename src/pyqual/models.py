@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from pyqual.constants import SURVEY_METADATA_IDS
+from pyqual.exceptions import InputError
 
 
 def _parse_qualtrics_datetime(value: datetime | str) -> datetime:
@@ -13,6 +17,18 @@ def _parse_qualtrics_datetime(value: datetime | str) -> datetime:
     return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 
+def _to_utc(value: datetime | str) -> datetime:
+    """Parse ``value`` and convert it to UTC, taking naive datetimes as UTC."""
+    value = _parse_qualtrics_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _format_qualtrics_datetime(value: datetime | str) -> str:
+    return _to_utc(value).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
 def _get_first_present(mapping: Mapping[str, Any], keys: tuple[str, ...]) -> Any:
     for key in keys:
         if key in mapping:
@@ -41,3 +57,259 @@ class QualtricsSurvey:
             creation_date=_parse_qualtrics_datetime(survey_dict['creationDate']),
             active=survey_dict['isActive'],
         )
+
+
+@dataclass
+class ContactImportReport:
+    batch_index: int
+    contact_count: int
+    import_id: str | None = None
+    status: str = 'pending'
+    added: int = 0
+    updated: int = 0
+    failed: int = 0
+    error: str | None = None
+    summary: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == 'complete' and self.error is None
+
+    def apply_summary(self, summary: Mapping[str, Any]) -> None:
+        counts = (summary.get('contacts') or {}).get('count') or {}
+        self.summary = summary
+        self.added = int(counts.get('added', 0))
+        self.updated = int(counts.get('updated', 0))
+        self.failed = int(counts.get('failed', 0))
+
+
+@dataclass(frozen=True)
+class SurveyQuestion:
+    question_id: str
+    name: str
+    text: str
+    question_type: str
+    selector: str | None = None
+    choices: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, question_id: str, question_dict: Mapping[str, Any]) -> SurveyQuestion:
+        question_type = question_dict.get('questionType') or {}
+        choices = question_dict.get('choices') or {}
+
+        return cls(
+            question_id=question_id,
+            name=question_dict.get('questionName', question_id),
+            text=question_dict.get('questionText', ''),
+            question_type=question_type.get('type', ''),
+            selector=question_type.get('selector'),
+            choices={choice_id: choice.get('choiceText', '') for choice_id, choice in choices.items()},
+        )
+
+
+@dataclass(frozen=True)
+class SurveyBlock:
+    block_id: str
+    description: str
+    question_ids: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, block_id: str, block_dict: Mapping[str, Any]) -> SurveyBlock:
+        return cls(
+            block_id=block_id,
+            description=block_dict.get('description', ''),
+            question_ids=tuple(
+                element['questionId']
+                for element in block_dict.get('elements') or ()
+                if element.get('type') == 'Question' and 'questionId' in element
+            ),
+        )
+
+
+class SurveyDefinition:
+    """Full survey definition as returned by the get-survey endpoint.
+
+    The raw payload is kept as is; questions, blocks and the export column
+    index are only built on first access and then cached, so wrapping a large
+    survey costs nothing until a lookup actually needs them.
+    """
+
+    def __init__(self, payload: Mapping[str, Any]) -> None:
+        self._payload = payload
+        self._questions: Dict[str, SurveyQuestion] = {}
+
+    @classmethod
+    def from_dict(cls, survey_dict: Mapping[str, Any]) -> SurveyDefinition:
+        return cls(survey_dict)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(survey_id={self.survey_id!r})'
+
+    @property
+    def raw(self) -> Mapping[str, Any]:
+        return self._payload
+
+    @property
+    def survey_id(self) -> str:
+        return self._payload['id']
+
+    @property
+    def name(self) -> str:
+        return self._payload['name']
+
+    @cached_property
+    def summary(self) -> QualtricsSurvey:
+        return QualtricsSurvey.from_dict(self._payload)
+
+    @property
+    def question_ids(self) -> Tuple[str, ...]:
+        return tuple(self._payload.get('questions') or ())
+
+    def question(self, question_id: str) -> SurveyQuestion:
+        """Return one question, parsing only that entry of the payload."""
+        try:
+            return self._questions[question_id]
+        except KeyError:
+            pass
+
+        question_dict = (self._payload.get('questions') or {})[question_id]
+        question = self._questions[question_id] = SurveyQuestion.from_dict(question_id, question_dict)
+        return question
+
+    @cached_property
+    def questions(self) -> Mapping[str, SurveyQuestion]:
+        return {question_id: self.question(question_id) for question_id in self.question_ids}
+
+    @cached_property
+    def blocks(self) -> Mapping[str, SurveyBlock]:
+        blocks = self._payload.get('blocks') or {}
+        return {block_id: SurveyBlock.from_dict(block_id, block) for block_id, block in blocks.items()}
+
+    @cached_property
+    def _question_blocks(self) -> Mapping[str, str]:
+        return {
+            question_id: block.block_id
+            for block in self.blocks.values()
+            for question_id in block.question_ids
+        }
+
+    def block_for_question(self, question_id: str) -> SurveyBlock:
+        return self.blocks[self._question_blocks[question_id]]
+
+    @cached_property
+    def export_columns(self) -> Mapping[str, str]:
+        """Map each export column name to the id of the question it belongs to."""
+        column_map = self._payload.get('exportColumnMap') or {}
+        return {
+            column: entry['question']
+            for column, entry in column_map.items()
+            if isinstance(entry, Mapping) and 'question' in entry
+        }
+
+    @cached_property
+    def _question_columns(self) -> Mapping[str, Tuple[str, ...]]:
+        columns: Dict[str, list] = {}
+        for column, question_id in self.export_columns.items():
+            columns.setdefault(question_id, []).append(column)
+        return {question_id: tuple(names) for question_id, names in columns.items()}
+
+    def question_id_for_column(self, column: str) -> str:
+        return self.export_columns[column]
+
+    def columns_for_question(self, question_id: str) -> Tuple[str, ...]:
+        return self._question_columns.get(question_id, ())
+
+    @cached_property
+    def embedded_data(self) -> Tuple[str, ...]:
+        return tuple(field_dict['name'] for field_dict in self._payload.get('embeddedData') or () if 'name' in field_dict)
+
+    @property
+    def flow(self) -> Any:
+        return self._payload.get('flow')
+
+
+@dataclass(frozen=True)
+class ExportSizeEstimate:
+    total_columns: int
+    selected_columns: int
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of columns left out of the export."""
+        if not self.total_columns:
+            return 0.0
+        return 1 - self.selected_columns / self.total_columns
+
+
+@dataclass
+class ResponseExportSpec:
+    """Typed description of which columns and responses an export should contain.
+
+    ``None`` for a column selection means "everything"; an empty sequence
+    leaves that group out. :meth:`to_body` produces the matching export
+    request options.
+    """
+    question_ids: Sequence[str] | None = None
+    embedded_data_ids: Sequence[str] | None = None
+    survey_metadata_ids: Sequence[str] | None = None
+    start_date: datetime | str | None = None
+    end_date: datetime | str | None = None
+    filter_id: str | None = None
+    compress: bool = True
+
+    def to_body(self) -> Dict[str, Any]:
+        body: Dict[str, Any] = {}
+        if self.question_ids is not None:
+            body['questionIds'] = list(self.question_ids)
+        if self.embedded_data_ids is not None:
+            body['embeddedDataIds'] = list(self.embedded_data_ids)
+        if self.survey_metadata_ids is not None:
+            body['surveyMetadataIds'] = list(self.survey_metadata_ids)
+        if self.start_date is not None:
+            body['startDate'] = _format_qualtrics_datetime(self.start_date)
+        if self.end_date is not None:
+            body['endDate'] = _format_qualtrics_datetime(self.end_date)
+        if not self.compress:
+            body['compress'] = False
+        return body
+
+    def validate(self, definition: SurveyDefinition) -> None:
+        """Raise :class:`InputError` if the spec asks for anything the survey does not have."""
+        problems: List[str] = []
+
+        unknown_questions = [qid for qid in self.question_ids or () if qid not in definition.question_ids]
+        if unknown_questions:
+            problems.append(f'unknown question ids {", ".join(unknown_questions)}')
+
+        unknown_fields = [name for name in self.embedded_data_ids or () if name not in definition.embedded_data]
+        if unknown_fields:
+            problems.append(f'unknown embedded data fields {", ".join(unknown_fields)}')
+
+        unknown_metadata = [name for name in self.survey_metadata_ids or () if name not in SURVEY_METADATA_IDS]
+        if unknown_metadata:
+            problems.append(f'unknown survey metadata ids {", ".join(unknown_metadata)}')
+
+        if self.start_date is not None and self.end_date is not None:
+            if _to_utc(self.start_date) >= _to_utc(self.end_date):
+                problems.append('start_date must be before end_date')
+
+        if problems:
+            raise InputError(f'Invalid export spec for survey {definition.survey_id}: {"; ".join(problems)}')
+
+    def estimate_size(self, definition: SurveyDefinition) -> ExportSizeEstimate:
+        """Estimate how many of the survey's export columns the spec keeps."""
+        all_questions = definition.question_ids
+        question_columns = {qid: len(definition.columns_for_question(qid)) or 1 for qid in all_questions}
+
+        selected_questions = all_questions if self.question_ids is None else self.question_ids
+        selected_fields = definition.embedded_data if self.embedded_data_ids is None else self.embedded_data_ids
+        selected_metadata = SURVEY_METADATA_IDS if self.survey_metadata_ids is None else self.survey_metadata_ids
+
+        return ExportSizeEstimate(
+            total_columns=sum(question_columns.values()) + len(definition.embedded_data) + len(SURVEY_METADATA_IDS),
+            selected_columns=(
+                sum(question_columns.get(qid, 1) for qid in selected_questions)
+                + len(selected_fields)
+                + len(selected_metadata)
+            ),
+        )
@@ -0,0 +1,196 @@
+"""Random access to single responses of an extracted export.
+
+The export file is memory-mapped and a byte-offset index keyed by response id
+is stored next to it (``<export>.idx.json``). The index is built once by a
+single scan; afterwards every lookup reads only the bytes of one record.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from pyqual.constants import QUALTRICS_HEADER_ROWS
+from pyqual.exceptions import InputError
+
+INDEX_SUFFIX = '.idx.json'
+INDEX_VERSION = 1
+ID_FIELDS = {'.csv': 'ResponseId', '.ndjson': 'responseId'}
+
+
+def _parse_csv_record(record: bytes) -> List[str]:
+    return next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')))
+
+
+class ExportReader:
+    """Look up responses of a CSV or NDJSON export by response id in O(1).
+    Parameters
+    ----------
+        path: str or path-like
+            The extracted ``.csv`` or ``.ndjson`` export file.
+        id_field: str
+            Column (CSV) or key (NDJSON) holding the response id.
+        header_rows: int
+            Header rows at the top of a CSV export, the first of which names the columns.
+        rebuild: bool
+            Ignore a saved index and scan the file again.
+    """
+
+    def __init__(
+            self,
+            path: str | os.PathLike[str],
+            id_field: str | None = None,
+            header_rows: int = QUALTRICS_HEADER_ROWS,
+            rebuild: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.format = self.path.suffix.lower()
+        if self.format not in ID_FIELDS:
+            raise InputError(f'Unsupported export file {self.path}; expected .csv or .ndjson')
+
+        self.id_field = id_field or ID_FIELDS[self.format]
+        self.header_rows = header_rows
+        self.index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self.columns: List[str] = []
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+
+        self._file = open(self.path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+            if rebuild or not self._load_index():
+                self._build_index()
+                self._save_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(path={str(self.path)!r})'
+
+    def __enter__(self) -> ExportReader:
+        return self
+
+    def __exit__(self, *args) -> bool:
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, response_id: object) -> bool:
+        return response_id in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def close(self) -> None:
+        if isinstance(getattr(self, '_mmap', None), mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def get(self, response_id: str) -> Dict[str, Any]:
+        """Return one response, reading only its own bytes.
+        Parameters
+        ----------
+        response_id: str
+             The response id (``R_...``).
+        Returns
+        -------
+        dict
+            Column name to value for CSV exports, the decoded record for NDJSON exports.
+
+        """
+        start, end = self._offsets[response_id]
+        record = self._mmap[start:end]
+        if self.format == '.ndjson':
+            return json.loads(record)
+        return dict(zip(self.columns, _parse_csv_record(record)))
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        stat = os.fstat(self._file.fileno())
+        return {
+            'version': INDEX_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'id_field': self.id_field,
+            'header_rows': self.header_rows,
+        }
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, encoding='utf-8') as index_file:
+                saved = json.load(index_file)
+        except (OSError, ValueError):
+            return False
+
+        if saved.get('fingerprint') != self._fingerprint():
+            return False
+
+        self.columns = saved['columns']
+        self._offsets = {response_id: tuple(span) for response_id, span in saved['offsets'].items()}
+        return True
+
+    def _save_index(self) -> None:
+        temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as index_file:
+            json.dump({
+                'fingerprint': self._fingerprint(),
+                'columns': self.columns,
+                'offsets': self._offsets,
+            }, index_file, separators=(',', ':'))
+        os.replace(temp_path, self.index_path)
+
+    def _records(self) -> Iterator[Tuple[int, int]]:
+        """Yield the byte span of every record, keeping quoted line breaks inside their record."""
+        data = self._mmap
+        size = len(data)
+        position = 3 if data[:3] == b'\xef\xbb\xbf' else 0
+        record_start = position
+        in_quotes = False
+
+        while position < size:
+            line_end = data.find(b'\n', position)
+            line_end = size if line_end == -1 else line_end + 1
+            if self.format == '.csv' and data[position:line_end].count(b'"') % 2:
+                in_quotes = not in_quotes
+            position = line_end
+
+            if not in_quotes:
+                end = line_end
+                while end > record_start and data[end - 1:end] in (b'\n', b'\r'):
+                    end -= 1
+                if end > record_start:
+                    yield record_start, end
+                record_start = line_end
+
+    def _build_index(self) -> None:
+        records = self._records()
+        self._offsets = {}
+
+        if self.format == '.ndjson':
+            for start, end in records:
+                record = json.loads(self._mmap[start:end])
+                self._offsets[record[self.id_field]] = (start, end)
+            return
+
+        header = next(records, None)
+        if header is None:
+            raise InputError(f'Export {self.path} is empty')
+        self.columns = _parse_csv_record(self._mmap[header[0]:header[1]])
+        try:
+            id_position = self.columns.index(self.id_field)
+        except ValueError:
+            raise InputError(f'Column {self.id_field} not in export {self.path}') from None
+
+        for _ in range(self.header_rows - 1):
+            next(records, None)
+
+        for start, end in records:
+            values = _parse_csv_record(self._mmap[start:end])
+            if id_position < len(values):
+                self._offsets[values[id_position]] = (start, end)
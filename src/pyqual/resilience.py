@@ -0,0 +1,302 @@
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Collection, Deque, Dict, Tuple, Type
+
+import requests
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, Timeout
+
+from pyqual.exceptions import CircuitOpenError
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Small, frequent polls; file downloads are left out, since hedging one doubles a large transfer.
+HEDGED_ENDPOINTS = frozenset({
+    'GET export_progress',
+    'GET contact_export_progress',
+    'GET contact_import_progress',
+})
+
+
+def _retry_after(response: requests.Response | None) -> float | None:
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('Retry-After')
+    if not isinstance(value, str) or not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is sent again.
+
+    Delays grow exponentially (``backoff_factor * 2 ** retry``) up to
+    ``max_backoff`` and are drawn uniformly below that bound ("full jitter"),
+    unless the server asks for a specific delay with ``Retry-After``.
+
+    Requests whose method is not in ``idempotent_methods`` (such as the POST
+    starting an export) are only retried when the server cannot have acted
+    on them: a connection that was never established, or a 429 rejection.
+
+    Parameters
+    ----------
+        max_retries: int
+            Retries after the first attempt.
+        backoff_factor: float
+            Seconds the first retry waits at most.
+        max_backoff: float
+            Upper bound in seconds for a single delay.
+        total_timeout: float
+            Time budget in seconds for all attempts, delays included.
+        retry_statuses: collection of int
+            Response status codes that are retried.
+        retry_exceptions: tuple of exception types
+            Exceptions that are retried.
+        idempotent_methods: collection of str
+            HTTP methods that are safe to send more than once.
+    """
+
+    def __init__(
+            self,
+            max_retries: int = 3,
+            backoff_factor: float = 0.5,
+            max_backoff: float = 30.0,
+            total_timeout: float | None = None,
+            retry_statuses: Collection[int] = RETRY_STATUSES,
+            retry_exceptions: Tuple[Type[BaseException], ...] = (RequestsConnectionError, Timeout),
+            idempotent_methods: Collection[str] = IDEMPOTENT_METHODS,
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError('max_retries must not be negative')
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.total_timeout = total_timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.idempotent_methods = frozenset(method.upper() for method in idempotent_methods)
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(max_retries={self.max_retries!r}, '
+                f'backoff_factor={self.backoff_factor!r}, total_timeout={self.total_timeout!r})')
+
+    @classmethod
+    def from_int(cls, retry: int) -> 'RetryPolicy':
+        """Return the policy for the plain ``retry`` count accepted by the clients."""
+        return cls(max_retries=retry if retry > 1 else 0)
+
+    def backoff(self, retry_number: int) -> float:
+        """Return a jittered delay before retry number ``retry_number`` (starting at 1)."""
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** (retry_number - 1))
+        return random.uniform(0, ceiling)
+
+    def is_retryable(self, method: str, error: BaseException) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+
+        idempotent = method.upper() in self.idempotent_methods
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+
+        if isinstance(status_code, int):
+            if status_code not in self.retry_statuses:
+                return False
+            return idempotent or status_code == requests.codes.too_many_requests
+
+        if not isinstance(error, self.retry_exceptions):
+            return False
+        return idempotent or isinstance(error, ConnectTimeout)
+
+    def next_delay(self, method: str, error: BaseException, retries: int, elapsed: float) -> float | None:
+        """Return seconds to wait before retrying, or ``None`` when the error should be raised.
+        Parameters
+        ----------
+        method: str
+             The HTTP verb of the failed request.
+        error: exception
+            What the last attempt raised.
+        retries: int
+            Retries already made.
+        elapsed: float
+            Seconds spent on all attempts so far.
+        Returns
+        -------
+        float or None
+            Delay before the next attempt.
+
+        """
+        if retries >= self.max_retries or not self.is_retryable(method, error):
+            return None
+
+        delay = _retry_after(getattr(error, 'response', None))
+        if delay is None:
+            delay = self.backoff(retries + 1)
+        delay = min(delay, self.max_backoff)
+
+        if self.total_timeout is not None and elapsed + delay >= self.total_timeout:
+            return None
+        return delay
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class HedgePolicy:
+    """Decide when an idempotent request is slow enough to send a second copy.
+
+    Latencies are tracked per endpoint over a sliding window. Once an endpoint
+    has ``min_samples`` observations, a request still unanswered after the
+    ``percentile`` latency of that window is hedged.
+
+    Parameters
+    ----------
+        percentile: float
+            Fraction of the latency distribution to wait for before hedging.
+        window: int
+            Number of recent latencies kept per endpoint.
+        min_samples: int
+            Observations required before an endpoint is hedged at all.
+        min_delay: float
+            Lower bound in seconds for the hedge delay.
+        max_workers: int
+            Size of the thread pool carrying hedged requests.
+        endpoints: collection of str
+            Endpoints, as ``'<METHOD> <ENDPOINTS name>'``, that may be hedged.
+            Defaults to the export and import progress polls.
+    """
+
+    def __init__(
+            self,
+            percentile: float = 0.95,
+            window: int = 200,
+            min_samples: int = 20,
+            min_delay: float = 0.01,
+            max_workers: int = 16,
+            endpoints: Collection[str] = HEDGED_ENDPOINTS,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError('percentile must be between 0 and 1')
+        if min_samples < 1 or window < min_samples:
+            raise ValueError('window must hold at least min_samples >= 1 latencies')
+
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self.endpoints = frozenset(endpoints)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(percentile={self.percentile!r}, window={self.window!r})'
+
+    def applies(self, endpoint: str) -> bool:
+        return endpoint in self.endpoints
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            latencies = self._latencies.setdefault(endpoint, deque(maxlen=self.window))
+            latencies.append(seconds)
+
+    def delay(self, endpoint: str) -> float | None:
+        """Return seconds to wait before hedging, or ``None`` while too few samples exist."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+
+        if len(latencies) < self.min_samples:
+            return None
+
+        index = min(len(latencies) - 1, int(self.percentile * len(latencies)))
+        return max(self.min_delay, latencies[index])
+
+
+@dataclass
+class _CircuitState:
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After ``failure_threshold`` consecutive failures an endpoint's circuit
+    opens and calls fail fast with :class:`CircuitOpenError`. Once
+    ``reset_timeout`` seconds have passed a single trial request is let
+    through; its success closes the circuit, its failure opens it again.
+
+    Parameters
+    ----------
+        failure_threshold: int
+            Consecutive failures that open the circuit.
+        reset_timeout: float
+            Seconds an open circuit waits before allowing a trial request.
+    """
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._states: Dict[str, _CircuitState] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(failure_threshold={self.failure_threshold!r}, '
+                f'reset_timeout={self.reset_timeout!r})')
+
+    def is_open(self, endpoint: str) -> bool:
+        with self._lock:
+            state = self._states.get(endpoint)
+            return state is not None and state.opened_at is not None
+
+    def before_request(self, endpoint: str) -> None:
+        """Raise :class:`CircuitOpenError` unless a request to ``endpoint`` may go ahead."""
+        with self._lock:
+            state = self._states.setdefault(endpoint, _CircuitState())
+            if state.opened_at is None:
+                return
+
+            remaining = state.opened_at + self.reset_timeout - self._clock()
+            if remaining > 0 or state.trial_in_flight:
+                raise CircuitOpenError(
+                    f'Circuit for {endpoint} is open after {state.failures} failures; '
+                    f'retry in {max(remaining, 0):.1f}s'
+                )
+            state.trial_in_flight = True
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            self._states[endpoint] = _CircuitState()
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            state = self._states.setdefault(endpoint, _CircuitState())
+            state.failures += 1
+            if state.trial_in_flight or state.failures >= self.failure_threshold:
+                state.opened_at = self._clock()
+            state.trial_in_flight = False
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List, Set
+
+import requests
+
+from pyqual.client import QualtricsResponseExportClient
+from pyqual.constants import FILE_EXTENSION
+from pyqual.events import ExportEventListener
+from pyqual.exceptions import ExportFailureError, ExportTimeoutError
+
+QUEUED = 'queued'
+STARTED = 'started'
+READY = 'ready'
+COMPLETE = 'complete'
+FAILED = 'failed'
+FINISHED_STATUSES = (COMPLETE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    survey_id TEXT NOT NULL,
+    file_format TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    filter_id TEXT,
+    body TEXT,
+    output_dir TEXT NOT NULL,
+    progress_id TEXT,
+    file_id TEXT,
+    status TEXT NOT NULL,
+    output_path TEXT,
+    error TEXT,
+    owner TEXT,
+    lease_until REAL
+)
+"""
+_COLUMNS = (
+    'job_id', 'survey_id', 'file_format', 'priority', 'filter_id', 'body',
+    'output_dir', 'progress_id', 'file_id', 'status', 'output_path', 'error',
+)
+
+
+@dataclass
+class ExportJob:
+    survey_id: str
+    file_format: str
+    priority: int = 0
+    filter_id: str | None = None
+    body: Dict[str, Any] | None = None
+    output_dir: str = 'MyQualtricsDownload'
+    progress_id: str | None = None
+    file_id: str | None = None
+    status: str = QUEUED
+    output_path: str | None = None
+    error: str | None = None
+    job_id: int | None = field(default=None, compare=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> ExportJob:
+        values = dict(zip(_COLUMNS, row))
+        values['body'] = json.loads(values['body']) if values['body'] is not None else None
+        return cls(**values)
+
+    def _to_row(self) -> tuple:
+        values = {name: getattr(self, name) for name in _COLUMNS}
+        values['body'] = json.dumps(self.body, sort_keys=True) if self.body is not None else None
+        return tuple(values[name] for name in _COLUMNS)
+
+
+def _is_transient_status(status_code: int | None) -> bool:
+    return (status_code is None
+            or status_code == requests.codes.too_many_requests
+            or status_code >= requests.codes.internal_server_error)
+
+
+class ExportJobStore:
+    """SQLite-backed record of export jobs, shared by every scheduler pointed at the same file.
+
+    A scheduler works on a job only while it holds the job's lease, taken with
+    :meth:`claim`, so schedulers in several processes never run the same job
+    twice. A lease that is not renewed expires, and the job of a crashed
+    scheduler is then picked up by the others.
+
+    Parameters
+    ----------
+        path: str or path-like
+            Location of the SQLite database; ``':memory:'`` keeps jobs in memory only.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def add(self, job: ExportJob) -> ExportJob:
+        """Persist a new job and assign its ``job_id``."""
+        columns = _COLUMNS[1:]
+        with self._lock:
+            cursor = self._connection.execute(
+                f"INSERT INTO export_jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                job._to_row()[1:],
+            )
+        job.job_id = cursor.lastrowid
+        return job
+
+    def update(self, job: ExportJob) -> None:
+        """Save the current state of an existing job."""
+        assignments = ', '.join(f'{name} = ?' for name in _COLUMNS[1:])
+        with self._lock:
+            self._connection.execute(
+                f"UPDATE export_jobs SET {assignments} WHERE job_id = ?",
+                (*job._to_row()[1:], job.job_id),
+            )
+
+    def get(self, job_id: int) -> ExportJob:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM export_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return ExportJob._from_row(row)
+
+    def jobs(self) -> List[ExportJob]:
+        """Return every stored job."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM export_jobs ORDER BY job_id"
+            ).fetchall()
+        return [ExportJob._from_row(row) for row in rows]
+
+    def pending(self) -> List[ExportJob]:
+        """Return the jobs that have not completed or failed, highest priority first."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM export_jobs "
+                f"WHERE status NOT IN ({', '.join('?' * len(FINISHED_STATUSES))}) "
+                "ORDER BY priority DESC, job_id",
+                FINISHED_STATUSES,
+            ).fetchall()
+        return [ExportJob._from_row(row) for row in rows]
+
+
+    def claim(
+            self,
+            owner: str,
+            lease_seconds: float,
+            max_running: int,
+            exclude: Collection[int] = (),
+    ) -> ExportJob | None:
+        """Lease the next unclaimed job to ``owner``.
+        Parameters
+        ----------
+        owner: str
+             Identifies the claiming scheduler.
+        lease_seconds: float
+            How long the lease lasts unless renewed.
+        max_running: int
+            Jobs that may hold a live lease at once, across every scheduler.
+        exclude: collection of int
+            Ids of jobs not to claim, such as those already tried in this run.
+        Returns
+        -------
+        ExportJob or None
+            The claimed job, or ``None`` if nothing is claimable or the limit is reached.
+
+        """
+        now = time.time()
+        unfinished = f"status NOT IN ({', '.join('?' * len(FINISHED_STATUSES))})"
+        excluded = f"job_id NOT IN ({', '.join('?' * len(exclude))})" if exclude else '1'
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                running, = self._connection.execute(
+                    f"SELECT COUNT(*) FROM export_jobs WHERE {unfinished} AND lease_until > ?",
+                    (*FINISHED_STATUSES, now),
+                ).fetchone()
+                row = None
+                if running < max_running:
+                    row = self._connection.execute(
+                        f"SELECT {', '.join(_COLUMNS)} FROM export_jobs "
+                        f"WHERE {unfinished} AND {excluded} AND (lease_until IS NULL OR lease_until <= ?) "
+                        "ORDER BY priority DESC, job_id LIMIT 1",
+                        (*FINISHED_STATUSES, *exclude, now),
+                    ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE export_jobs SET owner = ?, lease_until = ? WHERE job_id = ?",
+                        (owner, now + lease_seconds, row[0]),
+                    )
+                self._connection.execute('COMMIT')
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+        return None if row is None else ExportJob._from_row(row)
+
+    def unclaimed(self, exclude: Collection[int] = ()) -> int:
+        """Return how many unfinished jobs, other than those in ``exclude``, hold no live lease."""
+        excluded = f"AND job_id NOT IN ({', '.join('?' * len(exclude))}) " if exclude else ''
+        with self._lock:
+            count, = self._connection.execute(
+                f"SELECT COUNT(*) FROM export_jobs "
+                f"WHERE status NOT IN ({', '.join('?' * len(FINISHED_STATUSES))}) {excluded}"
+                "AND (lease_until IS NULL OR lease_until <= ?)",
+                (*FINISHED_STATUSES, *exclude, time.time()),
+            ).fetchone()
+        return count
+
+    def renew(self, owner: str, lease_seconds: float) -> None:
+        """Extend every lease held by ``owner``."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE export_jobs SET lease_until = ? WHERE owner = ? AND lease_until IS NOT NULL",
+                (time.time() + lease_seconds, owner),
+            )
+
+    def release(self, job: ExportJob, owner: str) -> None:
+        """Give up ``owner``'s lease on ``job``."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE export_jobs SET owner = NULL, lease_until = NULL WHERE job_id = ? AND owner = ?",
+                (job.job_id, owner),
+            )
+
+
+class ExportScheduler:
+    """Run response exports from a persistent priority queue.
+
+    Every step of a job (progress id, file id, output path) is written to the
+    store as soon as it is known, so after a restart :meth:`run` picks up
+    in-flight Qualtrics jobs where they left off instead of starting new ones.
+    Jobs are leased from the store one at a time, so several schedulers, in
+    this or other processes, can share one store.
+
+    Parameters
+    ----------
+        client: QualtricsResponseExportClient
+            Client used for every request.
+        store: ExportJobStore
+            Where job state is kept.
+        max_concurrency: int
+            Maximum number of jobs in progress at once across every scheduler
+            sharing the store.
+        lease_seconds: float
+            How long a claimed job stays reserved without renewal; leases are
+            renewed every third of it while the scheduler runs.
+        listener: ExportEventListener
+            Wake jobs on completion callbacks instead of polling every ``poll_interval``.
+    """
+
+    def __init__(
+            self,
+            client: QualtricsResponseExportClient,
+            store: ExportJobStore,
+            max_concurrency: int = 4,
+            max_polls: int = 120,
+            poll_interval: float = 1.0,
+            listener: ExportEventListener | None = None,
+            lease_seconds: float = 60.0,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        if lease_seconds <= 0:
+            raise ValueError('lease_seconds must be positive')
+
+        self._client = client
+        self._store = store
+        self._max_concurrency = max_concurrency
+        self._max_polls = max_polls
+        self._poll_interval = poll_interval
+        self._listener = listener
+        self._lease_seconds = lease_seconds
+        self._owner = uuid.uuid4().hex
+        self._claim_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(max_concurrency={self._max_concurrency!r})'
+
+    def submit(
+            self,
+            survey_id: str,
+            file_format: str,
+            priority: int = 0,
+            filter_id: str = None,
+            body: Dict[str, Any] = None,
+            output_dir: str | os.PathLike[str] = 'MyQualtricsDownload',
+    ) -> ExportJob:
+        """Queue an export. Jobs with a higher ``priority`` run first."""
+        if file_format not in FILE_EXTENSION:
+            raise ValueError('Unsupported file format')
+
+        job = self._store.add(ExportJob(
+            survey_id=survey_id,
+            file_format=file_format,
+            priority=priority,
+            filter_id=filter_id,
+            body=body,
+            output_dir=os.fspath(output_dir),
+        ))
+        return job
+
+    def run(self) -> List[ExportJob]:
+        """Process every unfinished job in the store and return the ones this scheduler ran, in their final state."""
+        processed: List[ExportJob] = []
+        tried: Set[int] = set()
+        stopped = threading.Event()
+        heartbeat = threading.Thread(target=self._renew_leases, args=(stopped,), name='pyqual-leases', daemon=True)
+        workers = [
+            threading.Thread(target=self._work, args=(processed, tried), name=f'pyqual-export-{index}', daemon=True)
+            for index in range(self._max_concurrency)
+        ]
+        heartbeat.start()
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+        return sorted(processed, key=lambda job: job.job_id)
+
+    def _renew_leases(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._lease_seconds / 3):
+            self._store.renew(self._owner, self._lease_seconds)
+
+    def _work(self, processed: List[ExportJob], tried: Set[int]) -> None:
+        # Each run tries a job once; jobs left pending wait for the next run.
+        while True:
+            with self._claim_lock:
+                job = self._store.claim(self._owner, self._lease_seconds, self._max_concurrency, exclude=tuple(tried))
+                if job is not None:
+                    tried.add(job.job_id)
+                remaining = job is not None or self._store.unclaimed(exclude=tuple(tried))
+            if not remaining:
+                return
+            if job is None:
+                # The shared limit is reached for now.
+                time.sleep(min(self._poll_interval, self._lease_seconds / 3) or 0.01)
+                continue
+
+            try:
+                self._process(job)
+            finally:
+                self._store.release(job, self._owner)
+            processed.append(job)
+
+    def _process(self, job: ExportJob) -> None:
+        client = self._client
+        try:
+            if job.progress_id is None:
+                response = client.start_response_export(job.survey_id, job.file_format, job.filter_id, body=job.body)
+                job.progress_id = response.json()['result']['progressId']
+                job.status = STARTED
+                self._store.update(job)
+
+            if job.file_id is None:
+                job.file_id = client.wait_for_export(
+                    job.survey_id,
+                    job.progress_id,
+                    max_polls=self._max_polls,
+                    poll_interval=self._poll_interval,
+                    listener=self._listener,
+                )
+                job.status = READY
+                self._store.update(job)
+
+            job.output_path = os.fspath(
+                client.download_export(job.survey_id, job.file_id, job.output_dir, file_format=job.file_format)
+            )
+            job.status = COMPLETE
+            job.error = None
+        except requests.HTTPError as http_error:
+            status_code = getattr(http_error.response, 'status_code', None)
+            job.error = str(http_error)
+            if status_code == requests.codes.not_found and job.file_id is not None:
+                # The export file expired; start a new export on the next run.
+                job.progress_id = None
+                job.file_id = None
+                job.status = QUEUED
+            elif not _is_transient_status(status_code):
+                job.status = FAILED
+        except (ExportTimeoutError, requests.RequestException) as transient_error:
+            # Keep the job pending so the next run resumes it.
+            job.error = str(transient_error)
+        except ExportFailureError as export_error:
+            job.status = FAILED
+            job.error = str(export_error)
+        except Exception as unexpected_error:
+            # A rejected request, a malformed response or a broken archive will
+            # not fix itself on the next run; record it instead of losing the worker.
+            job.status = FAILED
+            job.error = f'{type(unexpected_error).__name__}: {unexpected_error}'
+        self._store.update(job)
@@ -0,0 +1,204 @@
+"""HTTP transports used by :class:`pyqual.client.BaseClient`.
+
+Every transport returns :class:`requests.Response` objects and raises the
+``requests`` exception types, so the clients behave the same whichever
+backend carries the traffic.
+"""
+import importlib.util
+from abc import ABC, abstractmethod
+import json as jsonlib
+from typing import Any, Dict, Mapping
+from urllib.parse import urlencode
+
+import requests
+import urllib3
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+def _with_params(url: str, params: Mapping[str, Any] | None) -> str:
+    if not params:
+        return url
+    separator = '&' if '?' in url else '?'
+    return f'{url}{separator}{urlencode(params, doseq=True)}'
+
+
+def _encode_body(headers: Dict[str, str], json: Any, data: Any) -> Any:
+    if json is not None:
+        headers.setdefault('Content-Type', 'application/json')
+        return jsonlib.dumps(json).encode()
+    return data
+
+
+class Transport(ABC):
+    """Interface for sending HTTP requests on behalf of a client.
+    Parameters
+    ----------
+        headers: dict
+            Headers sent with every request.
+
+    Transports send every request exactly once; retries are left to the
+    client's :class:`~pyqual.resilience.RetryPolicy`.
+    """
+
+    name = ''
+
+    def __init__(self, headers: Mapping[str, str] | None = None) -> None:
+        self.headers = dict(headers or {})
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request.
+        Parameters
+        ----------
+        method: str
+             The HTTP verb for the request.
+        url : str
+            Full URL.
+        kwargs
+            ``timeout``, ``stream``, ``params``, ``json``, ``data`` and ``headers``
+            with the meaning they have in ``requests``.
+        Returns
+        -------
+        class:`requests.Response`
+            Response object of requests library.
+
+        """
+
+    def close(self) -> None:
+        """Release pooled connections."""
+
+
+class RequestsTransport(Transport):
+    """Default transport backed by a :class:`requests.Session`."""
+
+    name = 'requests'
+
+    def __init__(self, headers: Mapping[str, str] | None = None) -> None:
+        super().__init__(headers)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """Transport talking to ``urllib3`` directly, skipping the session and adapter layers of ``requests``."""
+
+    name = 'urllib3'
+
+    def __init__(self, headers: Mapping[str, str] | None = None) -> None:
+        super().__init__(headers)
+        self.pool = urllib3.PoolManager(headers=self.headers, retries=False)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        headers = {**self.headers, **(kwargs.get('headers') or {})}
+        body = _encode_body(headers, kwargs.get('json'), kwargs.get('data'))
+        full_url = _with_params(url, kwargs.get('params'))
+        stream = kwargs.get('stream', False)
+        timeout = kwargs.get('timeout')
+
+        try:
+            raw = self.pool.request(
+                method,
+                full_url,
+                body=body,
+                headers=headers,
+                timeout=urllib3.Timeout(total=timeout) if timeout is not None else None,
+                preload_content=False,
+            )
+        except (urllib3.exceptions.TimeoutError, urllib3.exceptions.MaxRetryError) as error:
+            reason = getattr(error, 'reason', None) or error
+            # NewConnectionError subclasses ConnectTimeoutError but is a refused connection.
+            if (isinstance(reason, urllib3.exceptions.TimeoutError)
+                    and not isinstance(reason, urllib3.exceptions.NewConnectionError)):
+                raise Timeout(reason) from error
+            raise RequestsConnectionError(reason) from error
+        except urllib3.exceptions.HTTPError as error:
+            raise RequestsConnectionError(error) from error
+
+        response = requests.Response()
+        response.status_code = raw.status
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = raw.reason
+        response.url = full_url
+        response.raw = raw
+
+        if not stream:
+            try:
+                response.content
+            finally:
+                raw.release_conn()
+
+        return response
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class HttpxTransport(Transport):
+    """Transport backed by ``httpx``, using HTTP/2 when the ``h2`` package is installed.
+
+    Install with ``pip install pyqual[httpx]``.
+    """
+
+    name = 'httpx'
+
+    def __init__(self, headers: Mapping[str, str] | None = None) -> None:
+        try:
+            import httpx
+        except ImportError as import_error:
+            raise ImportError('The httpx transport requires httpx: pip install pyqual[httpx]') from import_error
+
+        super().__init__(headers)
+        self._httpx = httpx
+        self.http2 = importlib.util.find_spec('h2') is not None
+        self.client = httpx.Client(
+            headers=self.headers,
+            transport=httpx.HTTPTransport(http2=self.http2),
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        httpx = self._httpx
+        try:
+            raw = self.client.request(
+                method,
+                url,
+                params=kwargs.get('params'),
+                json=kwargs.get('json'),
+                content=kwargs.get('data'),
+                headers=kwargs.get('headers'),
+                timeout=kwargs.get('timeout'),
+            )
+        except httpx.TimeoutException as error:
+            raise Timeout(error) from error
+        except httpx.TransportError as error:
+            raise RequestsConnectionError(error) from error
+
+        response = requests.Response()
+        response.status_code = raw.status_code
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = raw.encoding
+        response.reason = raw.reason_phrase
+        response.url = str(raw.url)
+        response._content = raw.content
+        return response
+
+    def close(self) -> None:
+        self.client.close()
+
+
+TRANSPORTS = {
+    transport.name: transport
+    for transport in (RequestsTransport, Urllib3Transport, HttpxTransport)
+}
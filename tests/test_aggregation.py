@@ -0,0 +1,98 @@
+import csv
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from pyqual import aggregation
+from pyqual.aggregation import CrossTab, Frequency, Mean, aggregate_export
+from pyqual.exceptions import InputError
+
+ROWS = [
+    ["R_1", "Yes", "5", "NO"],
+    ["R_2", "No", "3", "SE"],
+    ["R_3", "Yes", "", "NO"],
+    ["R_4", "Yes", "4", "SE"],
+    ["R_5", "", "n/a", "NO"],
+]
+
+
+def _export_csv(rows=ROWS):
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(["ResponseId", "Q1", "Q2", "Country"])
+    writer.writerow(["Response ID", "Do you agree?", "Score, from 1 to 5", "Country"])
+    writer.writerow(['{"ImportId":"_recordId"}', '{"ImportId":"QID1"}', '{"ImportId":"QID2"}', '{"ImportId":"country"}'])
+    writer.writerows(rows)
+    return text.getvalue()
+
+
+class AggregateExportTestCase(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.archive = self.root / "export.zip"
+        with zipfile.ZipFile(self.archive, "w") as zip_archive:
+            zip_archive.writestr("Survey.csv", _export_csv())
+        self.aggregations = {
+            "agree": Frequency("Q1"),
+            "score": Mean("Q2"),
+            "agree_by_country": CrossTab("Country", "Q1"),
+        }
+        self.expected = {
+            "agree": {"Yes": 3, "No": 1},
+            "score": {"count": 3, "mean": 4.0},
+            "agree_by_country": {"NO": {"Yes": 2}, "SE": {"No": 1, "Yes": 1}},
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_in_process_aggregation_over_archive(self):
+        self.assertEqual(aggregate_export(self.archive, self.aggregations, processes=1, chunk_size=2), self.expected)
+
+    def test_archive_is_aggregated_in_process_whatever_processes(self):
+        result = aggregate_export(self.archive, self.aggregations, processes=2, chunk_size=1)
+
+        self.assertEqual(result, self.expected)
+
+    def test_workers_split_extracted_file_on_record_boundaries(self):
+        rows = [
+            [f"R_{index}", "Yes" if index % 3 else "No", str(index % 5), f"multi\nline, \"quoted\" {index}"]
+            for index in range(200)
+        ]
+        export = self.root / "Survey.csv"
+        export.write_text("\ufeff" + _export_csv(rows), newline="")
+        aggregations = {"agree": Frequency("Q1"), "score": Mean("Q2"), "countries": Frequency("Country")}
+
+        in_process = aggregate_export(export, aggregations, processes=1)
+        parallel = aggregate_export(export, aggregations, processes=3)
+
+        self.assertEqual(parallel, in_process)
+        self.assertEqual(len(parallel["countries"]), 200)
+        self.assertEqual(sum(parallel["agree"].values()), 200)
+
+    def test_small_range_and_window_limits_keep_records_whole(self):
+        rows = [[f"R_{index}", "Yes", str(index % 5), f"line\n\"{index}\""] for index in range(50)]
+        export = self.root / "Survey.csv"
+        export.write_text(_export_csv(rows), newline="")
+        aggregations = {"agree": Frequency("Q1"), "score": Mean("Q2"), "countries": Frequency("Country")}
+        in_process = aggregate_export(export, aggregations, processes=1)
+
+        with mock.patch.object(aggregation, "MAX_RANGE_BYTES", 64), mock.patch.object(aggregation, "WINDOW_BYTES", 7):
+            parallel = aggregate_export(export, aggregations, processes=2)
+
+        self.assertEqual(parallel, in_process)
+        self.assertEqual(len(parallel["countries"]), 50)
+
+    def test_extracted_directory_is_accepted(self):
+        (self.root / "extracted").mkdir()
+        (self.root / "extracted" / "Survey.csv").write_text(_export_csv())
+
+        self.assertEqual(aggregate_export(self.root / "extracted", self.aggregations, processes=1), self.expected)
+
+    def test_unknown_column_is_rejected(self):
+        with self.assertRaises(InputError):
+            aggregate_export(self.archive, {"missing": Frequency("Q99")}, processes=1)
@@ -0,0 +1,129 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from pyqual.cache import ExportCache
+from pyqual.client import QualtricsResponseExportClient
+
+
+def _archive(text="id,value\n1,ok\n"):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_archive:
+        zip_archive.writestr("responses.csv", text)
+    return archive.getvalue()
+
+
+class ExportCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ExportCache(Path(self.temp_dir.name) / "cache", max_bytes=250)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_ignores_body_key_order(self):
+        first = ExportCache.key("SV_1", "2020-01-01T00:00:00Z", {"format": "csv", "a": 1, "b": [1, 2]})
+        second = ExportCache.key("SV_1", "2020-01-01T00:00:00Z", {"b": [1, 2], "a": 1, "format": "csv"})
+        changed = ExportCache.key("SV_1", "2020-01-02T00:00:00Z", {"format": "csv", "a": 1, "b": [1, 2]})
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, changed)
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get("missing"))
+
+        self.cache.put("key", b"content")
+
+        self.assertEqual(self.cache.get("key"), b"content")
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("old", b"x" * 100)
+        self.cache.put("recent", b"x" * 100)
+        past = time.time() - 60
+        os.utime(self.cache._entry_path("old"), (past, past))
+        os.utime(self.cache._entry_path("recent"), (past + 1, past + 1))
+        self.cache.get("old")
+
+        self.cache.put("new", b"x" * 100)
+
+        self.assertIsNotNone(self.cache.get("old"))
+        self.assertIsNone(self.cache.get("recent"))
+        self.assertLessEqual(self.cache.size(), 250)
+
+    def test_lock_files_are_shared_across_keys(self):
+        for index in range(20):
+            key = ExportCache.key(f"SV_{index}", "2020-01-01T00:00:00Z", {"format": "csv"})
+            with self.cache.lock(key):
+                self.cache.put(key, b"x" * 100)
+
+        lock_files = list(self.cache.directory.glob("*.lock"))
+        self.assertTrue(lock_files)
+        self.assertTrue(all(len(path.stem) == 2 for path in lock_files))
+        self.assertLessEqual(len(lock_files), 20)
+
+
+class CachedExportTestCase(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ExportCache(Path(self.temp_dir.name) / "cache")
+        self.client = QualtricsResponseExportClient(token="ABCEDEFGH")
+        self.client.get_survey_last_modified = mock.Mock(return_value="2020-01-01T00:00:00Z")
+        self.exports = 0
+        self.lock = threading.Lock()
+
+        def run_export(*args):
+            with self.lock:
+                self.exports += 1
+            time.sleep(0.05)
+            return _archive()
+
+        self.client._run_export = mock.Mock(side_effect=run_export)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _export(self, name, **kwargs):
+        return self.client.export_survey(
+            "SV_1", "csv", output_dir=Path(self.temp_dir.name) / name, cache=self.cache, **kwargs
+        )
+
+    def test_identical_export_is_served_from_cache(self):
+        self._export("first", body={"useLabels": True, "compress": True})
+        path = self._export("second", body={"compress": True, "useLabels": True})
+
+        self.assertEqual(self.exports, 1)
+        self.assertEqual((path / "responses.csv").read_text(), "id,value\n1,ok\n")
+
+    def test_uncompressed_export_is_cached_as_is(self):
+        self.client._run_export.side_effect = lambda *args: b"id,value\n1,raw\n"
+
+        self._export("first", body={"compress": False})
+        path = self._export("second", body={"compress": False})
+
+        self.assertEqual(self.client._run_export.call_count, 1)
+        self.assertEqual((path / "SV_1.csv").read_text(), "id,value\n1,raw\n")
+        self.assertEqual([entry.suffix for entry in self.cache.directory.glob("*.export")], [".export"])
+
+    def test_modified_survey_or_different_body_triggers_new_export(self):
+        self._export("first")
+        self._export("second", body={"useLabels": True})
+        self.client.get_survey_last_modified.return_value = "2020-01-02T00:00:00Z"
+        self._export("third")
+
+        self.assertEqual(self.exports, 3)
+
+    def test_concurrent_identical_exports_run_once(self):
+        threads = [threading.Thread(target=self._export, args=(f"out-{index}",)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.exports, 1)
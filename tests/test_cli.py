@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase, mock
+
+import pyqual
+from pyqual.cli import main
+
+# Generous ceiling for ``import pyqual.cli`` so the test only trips on real regressions.
+IMPORT_TIME_BUDGET_US = 150_000
+HEAVY_MODULES = ('requests', 'urllib3', 'pyqual.client', 'pyqual.managers')
+
+
+def _import_times(module: str):
+    env = dict(os.environ, PYTHONPATH=str(Path(pyqual.__file__).resolve().parents[1]))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, check=True,
+    )
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+class ImportTimeTestCase(TestCase):
+
+    def test_cli_does_not_import_heavy_modules(self):
+        times = _import_times('pyqual.cli')
+
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_cli_import_time_within_budget(self):
+        times = _import_times('pyqual.cli')
+
+        self.assertLess(times['pyqual.cli'], IMPORT_TIME_BUDGET_US)
+
+
+class CliTestCase(TestCase):
+
+    def _run(self, argv):
+        out = io.StringIO()
+        with mock.patch('sys.stdout', out), mock.patch('sys.stderr', io.StringIO()):
+            status = main(argv)
+        return status, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    @mock.patch('pyqual.client.QualtricsManageSurveyClient')
+    def test_activate_streams_one_line_per_survey(self, mock_client_class):
+        client = mock_client_class.return_value.__enter__.return_value
+        client.activate_survey.side_effect = [mock.Mock(status_code=200), RuntimeError('boom')]
+
+        status, lines = self._run(['--token', 'ABC', 'activate', 'SV_1', 'SV_2'])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(lines, [
+            {'survey_id': 'SV_1', 'status': 'ok', 'active': True},
+            {'survey_id': 'SV_2', 'status': 'error', 'error': 'boom'},
+        ])
+        mock_client_class.assert_called_once_with(token='ABC', data_center='fra1')
+
+    @mock.patch('pyqual.client.QualtricsResponseExportClient')
+    def test_export_writes_each_survey_to_its_own_directory(self, mock_client_class):
+        client = mock_client_class.return_value.__enter__.return_value
+        client.export_survey.side_effect = lambda survey_id, *args, **kwargs: kwargs['output_dir']
+
+        status, lines = self._run(['export', 'SV_1', '--output-dir', 'out', '--workers', '1'])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(lines, [{'survey_id': 'SV_1', 'status': 'ok', 'path': str(Path('out') / 'SV_1')}])
+
+    def test_missing_token_reports_error(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            status, lines = self._run(['deactivate', 'SV_1'])
+
+        self.assertEqual(status, 2)
+        self.assertEqual(lines, [])
@@ -1,17 +1,22 @@
+import csv
 import io
 import os
 import random
 import tempfile
+import threading
 import zipfile
+from datetime import datetime
 from pathlib import Path
 from unittest import TestCase, main, mock
 
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import Timeout, HTTPError
 
-from pyqual.client import BaseClient, QualtricsManageSurveyClient, QualtricsResponseExportClient
+from pyqual.client import BaseClient, QualtricsDirectoryClient, QualtricsManageSurveyClient, QualtricsResponseExportClient
 from pyqual.constants import DATA_CENTERS, BASE_URL
 from pyqual.exceptions import ExportFailureError, InvalidDataCenterError, MinimumSurveyCountError
+from pyqual.models import ResponseExportSpec
+from pyqual.resilience import RetryPolicy
 
 
 def _response(payload=None, content=b"", status_code=200):
@@ -39,6 +44,9 @@ class BaseClientTestCase(TestCase):
         self.invalid_test_data_center = self.test_data_center[:-1]
         self.test_token = 'ABCEDEFGH'
         self.client = BaseClient(token=self.test_token, data_center=self.test_data_center)
+        sleep_patcher = mock.patch.object(RetryPolicy, 'sleep')
+        self.mock_sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
 
     def test_init(self):
         self.assertIsInstance(self.client, BaseClient)
@@ -184,6 +192,20 @@ class QualtricsResponseExportClientTestCase(TestCase):
         filter_data = response.json()["result"]['elements']
         self.assertEqual(filter_data[0]["filterId"], "fecb8b08-a920-4e28-b5ce-d67a1ef67a39")
 
+    @mock.patch.object(QualtricsResponseExportClient, "_make_request")
+    def test_create_event_subscription(self, mock_make_request):
+        self.client.create_event_subscription("surveyengine.completedResponse.SV_123", "https://example.com/events")
+
+        mock_make_request.assert_called_once_with(
+            'POST',
+            url=f'{self.client.base_url}eventsubscriptions/',
+            json={
+                'topics': 'surveyengine.completedResponse.SV_123',
+                'publicationUrl': 'https://example.com/events',
+                'encrypt': False,
+            },
+        )
+
     @mock.patch.object(QualtricsResponseExportClient, "_make_request")
     def test_export_survey_downloads_and_extracts_zip(self, mock_make_request):
         archive = io.BytesIO()
@@ -215,6 +237,147 @@ class QualtricsResponseExportClientTestCase(TestCase):
             mock.call('GET', url=f'{self.client.base_url}surveys/SV_123/export-responses/file-1/file'),
         ])
 
+    @mock.patch.object(QualtricsResponseExportClient, "_make_request")
+    def test_export_survey_applies_spec_and_writes_uncompressed_file(self, mock_make_request):
+        mock_make_request.side_effect = [
+            _response({"result": {"progressId": "progress-1"}}),
+            _response({"result": {"status": "complete", "percentComplete": 100, "fileId": "file-1"}}),
+            _response(content=b"ResponseId,Q1\nR_1,ok\n"),
+        ]
+        spec = ResponseExportSpec(
+            question_ids=["QID1"],
+            embedded_data_ids=[],
+            start_date=datetime(2020, 1, 1),
+            filter_id="filter-1",
+            compress=False,
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = self.client.export_survey(
+                'SV_123', 'csv', output_dir=temp_dir, poll_interval=0, spec=spec, body={'useLabels': True},
+            )
+
+            self.assertEqual((output_dir / "SV_123.csv").read_bytes(), b"ResponseId,Q1\nR_1,ok\n")
+
+        mock_make_request.assert_any_call(
+            'POST',
+            url=f'{self.client.base_url}surveys/SV_123/export-responses/',
+            json={
+                'format': 'csv',
+                'filterId': 'filter-1',
+                'questionIds': ['QID1'],
+                'embeddedDataIds': [],
+                'startDate': '2020-01-01T00:00:00Z',
+                'compress': False,
+                'useLabels': True,
+            },
+        )
+
+    def _shard_archive(self, body, file_format='csv'):
+        archive = io.BytesIO()
+        day = body['startDate'][:10]
+        with zipfile.ZipFile(archive, "w") as zip_archive:
+            if file_format == 'csv':
+                zip_archive.writestr(
+                    "Survey.csv",
+                    'ResponseId,Q1\r\nResponse ID,"Question\r\ntext"\r\n{"ImportId":"_recordId"},{"ImportId":"QID1"}\r\n'
+                    f'R_{day},"answer\r\nfrom {day}"\r\n',
+                )
+            else:
+                zip_archive.writestr("Survey.ndjson", f'{{"responseId": "R_{day}"}}')
+        return archive.getvalue()
+
+    def test_export_survey_sharded_retries_failed_shard_and_merges_in_order(self):
+        attempts = []
+
+        def run_export(survey_id, file_format, filter_id, body, max_polls, poll_interval, listener):
+            attempts.append(body['startDate'])
+            if body['startDate'].startswith('2024-01-02') and attempts.count(body['startDate']) == 1:
+                raise ExportFailureError("Export failed")
+            return self._shard_archive(body)
+
+        with mock.patch.object(self.client, '_run_export', side_effect=run_export), \
+                tempfile.TemporaryDirectory() as temp_dir:
+            result = self.client.export_survey_sharded(
+                'SV_123', 'csv',
+                start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 4),
+                shards=3, body={'useLabels': True}, output_dir=temp_dir,
+            )
+
+            with open(result, encoding='utf-8-sig', newline='') as merged:
+                rows = list(csv.reader(merged))
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['SV_123.csv'])
+
+        self.assertEqual(sorted(attempts), [
+            '2024-01-01T00:00:00Z', '2024-01-02T00:00:00Z', '2024-01-02T00:00:00Z', '2024-01-03T00:00:00Z',
+        ])
+        self.assertEqual(rows[:3], [
+            ['ResponseId', 'Q1'], ['Response ID', 'Question\r\ntext'], ['{"ImportId":"_recordId"}', '{"ImportId":"QID1"}'],
+        ])
+        self.assertEqual([row[0] for row in rows[3:]], ['R_2024-01-01', 'R_2024-01-02', 'R_2024-01-03'])
+        self.assertEqual(rows[3][1], 'answer\r\nfrom 2024-01-01')
+
+    def test_export_survey_sharded_sets_contiguous_windows_and_merges_ndjson(self):
+        bodies = []
+
+        def run_export(survey_id, file_format, filter_id, body, max_polls, poll_interval, listener):
+            bodies.append(body)
+            return self._shard_archive(body, 'ndjson')
+
+        with mock.patch.object(self.client, '_run_export', side_effect=run_export), \
+                tempfile.TemporaryDirectory() as temp_dir:
+            result = self.client.export_survey_sharded(
+                'SV_123', 'ndjson',
+                start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 3), shards=2, output_dir=temp_dir,
+            )
+            lines = result.read_text().splitlines()
+
+        windows = sorted((body['startDate'], body['endDate']) for body in bodies)
+        self.assertEqual(windows, [
+            ('2024-01-01T00:00:00Z', '2024-01-02T00:00:00Z'), ('2024-01-02T00:00:00Z', '2024-01-03T00:00:00Z'),
+        ])
+        self.assertEqual(lines, ['{"responseId": "R_2024-01-01"}', '{"responseId": "R_2024-01-02"}'])
+
+    def test_export_survey_sharded_merges_uncompressed_shards(self):
+        def run_export(survey_id, file_format, filter_id, body, max_polls, poll_interval, listener):
+            header = 'ResponseId\r\nResponse ID\r\n{"ImportId":"_recordId"}\r\n'
+            return f'{header}R_{body["startDate"][:10]}\r\n'.encode()
+
+        with mock.patch.object(self.client, '_run_export', side_effect=run_export), \
+                tempfile.TemporaryDirectory() as temp_dir:
+            result = self.client.export_survey_sharded(
+                'SV_123', 'csv',
+                start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 3), shards=2,
+                body={'compress': False}, output_dir=temp_dir,
+            )
+            with open(result, encoding='utf-8-sig', newline='') as merged:
+                rows = list(csv.reader(merged))
+
+        self.assertEqual([row[0] for row in rows[3:]], ['R_2024-01-01', 'R_2024-01-02'])
+
+    @mock.patch.object(QualtricsResponseExportClient, "get_response_export_file")
+    def test_download_export_saves_uncompressed_file(self, mock_get_file):
+        mock_get_file.return_value = _response(content=b"ResponseId\nR_1\n")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.client.download_export('SV_123', 'file-1', temp_dir, file_format='csv')
+            self.assertEqual((Path(temp_dir) / "SV_123.csv").read_bytes(), b"ResponseId\nR_1\n")
+
+            with self.assertRaises(ExportFailureError):
+                self.client.download_export('SV_123', 'file-1', temp_dir)
+
+    def test_export_survey_sharded_gives_up_after_max_attempts(self):
+        with mock.patch.object(self.client, '_run_export', side_effect=ExportFailureError("Export failed")) as run, \
+                tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(ExportFailureError) as context:
+                self.client.export_survey_sharded(
+                    'SV_123', 'csv', start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 2),
+                    shards=2, max_attempts=2, output_dir=temp_dir,
+                )
+
+        self.assertIn('2 shard(s) failed after 2 attempts', str(context.exception))
+        self.assertEqual(run.call_count, 4)
+
     def test_extract_export_rejects_unsafe_paths(self):
         archive = io.BytesIO()
         with zipfile.ZipFile(archive, "w") as zip_archive:
@@ -269,6 +432,93 @@ class QualtricsManageSurveyClientTestCase(TestCase):
 
         self.assertEqual(len(surveys), 100)
 
+    @mock.patch("pyqual.client.requests.Session.request")
+    def test_iter_all_surveys_prefetches_next_page_and_stops_early(self, mock_request):
+        pages = {
+            None: _response({"result": {
+                "elements": [_survey(index) for index in range(100)],
+                "nextPage": f"{self.client.base_url}surveys?offset=100",
+            }}),
+            100: _response({"result": {
+                "elements": [_survey(index) for index in range(100, 200)],
+                "nextPage": f"{self.client.base_url}surveys?offset=200",
+            }}),
+        }
+        second_page_requested = threading.Event()
+
+        def fake_request(method, url, params=None, **kwargs):
+            offset = (params or {}).get("offset")
+            if offset == 100:
+                second_page_requested.set()
+            return pages[offset]
+
+        mock_request.side_effect = fake_request
+
+        surveys = self.client.iter_all_surveys()
+        first = next(surveys)
+
+        self.assertEqual(first["id"], "SV_0")
+        self.assertTrue(second_page_requested.wait(timeout=5))
+
+        surveys.close()
+        self.assertEqual(mock_request.call_count, 2)
+
+    @mock.patch("pyqual.client.requests.Session.request")
+    def test_iter_directories_follows_skip_token(self, mock_request):
+        mock_request.side_effect = [
+            _response({"result": {
+                "elements": [{"directoryId": "POOL_1"}],
+                "nextPage": "https://x/API/v3/directories?skipToken=abc%3D%3D",
+            }}),
+            _response({"result": {"elements": [{"directoryId": "POOL_2"}], "nextPage": None}}),
+        ]
+
+        directories = list(self.client.iter_directories())
+
+        self.assertEqual([directory["directoryId"] for directory in directories], ["POOL_1", "POOL_2"])
+        self.assertEqual(mock_request.call_args.kwargs["params"], {"skipToken": "abc=="})
+
+    @mock.patch("pyqual.client.requests.Session.request")
+    def test_iter_directories_follows_next_page(self, mock_request):
+        mock_request.side_effect = [
+            _response({"result": {"elements": [{"directoryId": "POOL_1"}], "nextPage": "https://x/directories?offset=1"}}),
+            _response({"result": {"elements": [{"directoryId": "POOL_2"}], "nextPage": None}}),
+        ]
+
+        directories = list(self.client.iter_directories())
+
+        self.assertEqual([directory["directoryId"] for directory in directories], ["POOL_1", "POOL_2"])
+        self.assertEqual(mock_request.call_args.kwargs["params"], {"offset": 1})
+
+    @mock.patch("pyqual.client.requests.Session.request")
+    def test_get_surveys_pairs_each_id_with_response_or_error(self, mock_request):
+        def fake_request(method, url, **kwargs):
+            if url.endswith('SV_bad'):
+                raise HTTPError(response=_response({"meta": {"error": {"errorMessage": "Not found"}}}, status_code=404))
+            return _response({"result": _survey(url.rsplit('_', 1)[-1])})
+
+        mock_request.side_effect = fake_request
+
+        results = dict(self.client.get_surveys(["SV_1", "SV_2", "SV_bad", "SV_1"], max_workers=2))
+
+        self.assertEqual(set(results), {"SV_1", "SV_2", "SV_bad"})
+        self.assertEqual(results["SV_2"].json()["result"]["id"], "SV_2")
+        self.assertIsInstance(results["SV_bad"], HTTPError)
+        self.assertIn("Not found", str(results["SV_bad"]))
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_get_surveys_rejects_non_positive_worker_count(self):
+        with self.assertRaises(ValueError):
+            list(self.client.get_surveys(["SV_1"], max_workers=0))
+
+    def test_context_manager_reopens_closed_session(self):
+        with self.client:
+            pass
+        self.assertIsNone(self.client.session)
+
+        with self.client as client:
+            self.assertIsNotNone(client.session)
+
     @mock.patch("pyqual.client.requests.Session.request")
     def test_activate_survey(self, mock_request):
         mock_request.return_value = _response()
@@ -285,5 +535,89 @@ class QualtricsManageSurveyClientTestCase(TestCase):
         )
 
 
+class QualtricsDirectoryClientTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.client = QualtricsDirectoryClient(token='ABCEDEFGH')
+        self.lists_url = f'{self.client.base_url}directories/POOL_1/mailinglists/CG_1'
+
+    @mock.patch.object(QualtricsDirectoryClient, "_make_request")
+    def test_get_mailing_lists_follows_skip_token(self, mock_make_request):
+        mock_make_request.side_effect = [
+            _response({"result": {
+                "elements": [{"mailingListId": "CG_1"}],
+                "nextPage": f"{self.client.base_url}directories/POOL_1/mailinglists?skipToken=page-2",
+            }}),
+            _response({"result": {"elements": [{"mailingListId": "CG_2"}], "nextPage": None}}),
+        ]
+
+        mailing_lists = list(self.client.get_mailing_lists('POOL_1'))
+
+        self.assertEqual([mailing_list["mailingListId"] for mailing_list in mailing_lists], ["CG_1", "CG_2"])
+        mock_make_request.assert_called_with(
+            method='GET', url=f'{self.client.base_url}directories/POOL_1/mailinglists', params={'skipToken': 'page-2'}
+        )
+
+    @mock.patch.object(QualtricsDirectoryClient, "_make_request")
+    def test_import_contacts_streams_bounded_batches_and_reports_each(self, mock_make_request):
+        sent_batches = []
+
+        def fake_request(method, url, **kwargs):
+            if method == 'POST':
+                sent_batches.append(kwargs['json']['contacts'])
+                if len(sent_batches) == 2:
+                    raise HTTPError('HTTP error occurred. Invalid contact')
+                return _response({"result": {"id": f"PGR_{len(sent_batches)}"}})
+            if url.endswith('/summary'):
+                return _response({"result": {"contacts": {"count": {"added": 2, "updated": 1, "failed": 0}}}})
+            return _response({"result": {"status": "complete", "percentComplete": 100.0}})
+
+        mock_make_request.side_effect = fake_request
+        contacts = ({"email": f"person{index}@example.com"} for index in range(7))
+
+        reports = self.client.import_contacts('POOL_1', 'CG_1', contacts, batch_size=3, poll_interval=0)
+
+        self.assertEqual([len(batch) for batch in sent_batches], [3, 3, 1])
+        self.assertEqual([report.status for report in reports], ['complete', 'failed', 'complete'])
+        self.assertEqual((reports[0].import_id, reports[0].added, reports[0].updated), ('PGR_1', 2, 1))
+        self.assertIn('Invalid contact', reports[1].error)
+        mock_make_request.assert_any_call('GET', url=f'{self.lists_url}/contactimports/PGR_3/summary')
+
+    @mock.patch.object(QualtricsDirectoryClient, "_make_request")
+    def test_import_contacts_reports_failed_job(self, mock_make_request):
+        mock_make_request.side_effect = [
+            _response({"result": {"id": "PGR_1"}}),
+            _response({"result": {"status": "failed"}}),
+        ]
+
+        reports = self.client.import_contacts('POOL_1', 'CG_1', [{"email": "a@example.com"}], poll_interval=0)
+
+        self.assertFalse(reports[0].succeeded)
+        self.assertEqual(reports[0].error, 'Directory job failed')
+
+    @mock.patch.object(QualtricsDirectoryClient, "_make_request")
+    def test_export_contacts_downloads_and_extracts_zip(self, mock_make_request):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_archive:
+            zip_archive.writestr("contacts.json", "[]")
+
+        mock_make_request.side_effect = [
+            _response({"result": {"id": "EXP_1"}}),
+            _response({"result": {"status": "complete", "fileId": "FILE_1"}}),
+            _response(content=archive.getvalue()),
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.client.export_contacts('POOL_1', 'CG_1', output_dir=temp_dir, poll_interval=0)
+            self.assertTrue((result / "contacts.json").exists())
+
+        mock_make_request.assert_has_calls([
+            mock.call('POST', url=f'{self.client.base_url}directories/POOL_1/exportcontacts',
+                      json={'mailingListId': 'CG_1'}),
+            mock.call('GET', url=f'{self.client.base_url}directories/POOL_1/exportcontacts/EXP_1'),
+            mock.call('GET', url=f'{self.client.base_url}directories/POOL_1/exportcontacts/FILE_1/file'),
+        ])
+
+
 if __name__ == '__main__':
     main()
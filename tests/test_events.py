@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from unittest import TestCase, mock
+
+import requests
+
+from pyqual.client import QualtricsResponseExportClient
+from pyqual.events import ExportEventListener
+
+
+def _progress(status, file_id=None):
+    result = {"status": status, "percentComplete": 100 if status == "complete" else 0}
+    if file_id is not None:
+        result["fileId"] = file_id
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {"result": result}
+    return response
+
+
+def _post_callback(url, message, delay=0.05):
+    """Stand in for Qualtrics: post an event-subscription callback after ``delay``."""
+    def post():
+        time.sleep(delay)
+        requests.post(url, data={"Topic": "export.completed", "MSG": json.dumps(message)}, timeout=5)
+
+    thread = threading.Thread(target=post)
+    thread.start()
+    return thread
+
+
+class ExportEventListenerTestCase(TestCase):
+
+    def setUp(self):
+        self.listener = ExportEventListener(fallback_interval=10)
+        self.listener.start()
+        self.addCleanup(self.listener.close)
+
+    def test_callback_wakes_waiting_export(self):
+        thread = _post_callback(self.listener.url, {"ProgressID": "ES_1", "SurveyID": "SV_1"})
+
+        started = time.monotonic()
+        self.assertTrue(self.listener.wait("SV_1", "ES_1"))
+        thread.join()
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertFalse(self.listener.wait("SV_1", "ES_1", timeout=0.01))
+
+    def test_callback_for_other_export_is_ignored(self):
+        _post_callback(self.listener.url, {"ProgressID": "ES_2", "SurveyID": "SV_1"}, delay=0).join()
+
+        self.assertFalse(self.listener.wait("SV_1", "ES_1", timeout=0.05))
+
+    def test_malformed_callback_is_rejected(self):
+        response = requests.post(self.listener.url, data=b"\xff", timeout=5)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_wait_for_export_is_woken_by_callback(self):
+        client = QualtricsResponseExportClient(token="ABCEDEFGH")
+        client.get_response_export_progress = mock.Mock(
+            side_effect=[_progress("inProgress"), _progress("complete", "file-1")]
+        )
+        thread = _post_callback(self.listener.url, {"ProgressID": "ES_1"})
+
+        started = time.monotonic()
+        file_id = client.wait_for_export("SV_1", "ES_1", poll_interval=0.01, listener=self.listener)
+        thread.join()
+
+        self.assertEqual(file_id, "file-1")
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(client.get_response_export_progress.call_count, 2)
+
+    def test_wait_for_export_falls_back_to_polling(self):
+        client = QualtricsResponseExportClient(token="ABCEDEFGH")
+        client.get_response_export_progress = mock.Mock(
+            side_effect=[_progress("inProgress"), _progress("inProgress"), _progress("complete", "file-1")]
+        )
+        self.listener.fallback_interval = 0.01
+
+        self.assertEqual(
+            client.wait_for_export("SV_1", "ES_1", poll_interval=0.01, listener=self.listener), "file-1"
+        )
+
+    def test_survey_callback_wakes_every_waiter_of_the_survey(self):
+        woken = []
+        since = self.listener.generation("SV_1", "ES_0")
+
+        def wait(progress_id):
+            woken.append(self.listener.wait("SV_1", progress_id, timeout=5, since=since))
+
+        waiters = [threading.Thread(target=wait, args=(f"ES_{index}",)) for index in range(3)]
+        for waiter in waiters:
+            waiter.start()
+
+        started = time.monotonic()
+        self.listener.notify({"SurveyID": "SV_1", "ResponseID": "R_1"})
+        for waiter in waiters:
+            waiter.join()
+
+        self.assertEqual(woken, [True, True, True])
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_callback_bursts_are_rate_limited_and_do_not_exhaust_the_wait(self):
+        client = QualtricsResponseExportClient(token="ABCEDEFGH")
+        checks = []
+
+        def progress(survey_id, progress_id):
+            checks.append(time.monotonic())
+            return _progress("complete", "file-1") if len(checks) == 4 else _progress("inProgress")
+
+        client.get_response_export_progress = mock.Mock(side_effect=progress)
+        stop = threading.Event()
+
+        def burst():
+            while not stop.is_set():
+                self.listener.notify({"SurveyID": "SV_1"})
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        try:
+            file_id = client.wait_for_export("SV_1", "ES_1", max_polls=5, poll_interval=0.1, listener=self.listener)
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(file_id, "file-1")
+        gaps = [later - earlier for earlier, later in zip(checks, checks[1:])]
+        self.assertTrue(all(gap >= 0.09 for gap in gaps), gaps)
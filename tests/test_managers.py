@@ -4,6 +4,7 @@ from unittest import TestCase, mock
 from pyqual.constants import DATA_CENTERS
 from pyqual.exceptions import InvalidDataCenterError
 from pyqual.managers import BaseManager, QualtricsManager
+from pyqual.models import QualtricsSurvey
 
 
 class BaseClientTestCase(TestCase):
@@ -37,6 +38,27 @@ class QualtricsManagerTestCase(TestCase):
         self.client.__exit__ = mock.Mock(return_value=False)
         self.manager._client = self.client
 
+    def test_retrieve_surveys_maps_ids_to_surveys_or_errors(self):
+        response = mock.Mock()
+        response.json.return_value = {"result": {
+            "id": "SV_1",
+            "name": "Survey 1",
+            "ownerId": "owner",
+            "lastModified": "2010-01-01T09:37:31Z",
+            "creationDate": "2010-01-01T09:37:31Z",
+            "isActive": True,
+        }}
+        error = ConnectionError("boom")
+        self.context_client.get_surveys.return_value = iter([("SV_2", error), ("SV_1", response)])
+
+        result = self.manager.retrieve_surveys(["SV_1", "SV_2"], max_workers=4)
+
+        self.assertIsInstance(result["SV_1"], QualtricsSurvey)
+        self.assertEqual(result["SV_1"].survey_id, "SV_1")
+        self.assertIs(result["SV_2"], error)
+        self.context_client.get_surveys.assert_called_once_with(["SV_1", "SV_2"], max_workers=4)
+        self.client.__exit__.assert_called_once()
+
     def test_deactivate_survey(self):
         response = mock.Mock(status_code=200)
         self.context_client.deactivate_survey.return_value = response
@@ -1,7 +1,46 @@
 from datetime import datetime, timezone
 from unittest import TestCase
 
-from pyqual.models import QualtricsSurvey
+from pyqual.exceptions import InputError
+from pyqual.models import QualtricsSurvey, ResponseExportSpec, SurveyDefinition
+
+SURVEY_DEFINITION = {
+    "id": "SV_123",
+    "name": "Test Survey",
+    "ownerId": "owner",
+    "lastModifiedDate": "2010-01-01T09:37:31Z",
+    "creationDate": "2010-01-01T09:37:31Z",
+    "isActive": True,
+    "questions": {
+        "QID1": {
+            "questionText": "How satisfied are you?",
+            "questionName": "Q1",
+            "questionType": {"type": "MC", "selector": "SAVR"},
+            "choices": {"1": {"choiceText": "Very"}, "2": {"choiceText": "Not at all"}},
+        },
+        "QID2": {
+            "questionText": "Rate each item",
+            "questionName": "Q2",
+            "questionType": {"type": "Matrix", "selector": "Likert"},
+        },
+    },
+    "blocks": {
+        "BL_1": {
+            "description": "Default Question Block",
+            "elements": [
+                {"type": "Question", "questionId": "QID1"},
+                {"type": "PageBreak"},
+                {"type": "Question", "questionId": "QID2"},
+            ],
+        },
+    },
+    "exportColumnMap": {
+        "Q1": {"question": "QID1"},
+        "Q2_1": {"question": "QID2", "subQuestion": "QID2.subQuestions.1"},
+        "Q2_2": {"question": "QID2", "subQuestion": "QID2.subQuestions.2"},
+    },
+    "embeddedData": [{"name": "source"}],
+}
 
 
 class QualtricsSurveyTestCase(TestCase):
@@ -30,3 +69,98 @@ class QualtricsSurveyTestCase(TestCase):
         })
 
         self.assertEqual(survey.creation_date, datetime(2010, 1, 1, 9, 37, 31, tzinfo=timezone.utc))
+
+
+class SurveyDefinitionTestCase(TestCase):
+
+    def setUp(self):
+        self.definition = SurveyDefinition.from_dict(SURVEY_DEFINITION)
+
+    def test_question_is_parsed_on_demand_and_cached(self):
+        question = self.definition.question("QID1")
+
+        self.assertEqual(question.name, "Q1")
+        self.assertEqual(question.question_type, "MC")
+        self.assertEqual(question.choices, {"1": "Very", "2": "Not at all"})
+        self.assertIs(self.definition.question("QID1"), question)
+        self.assertNotIn("QID2", self.definition._questions)
+
+    def test_unknown_question_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.definition.question("QID99")
+
+    def test_export_columns_map_back_to_questions(self):
+        self.assertEqual(self.definition.question_id_for_column("Q2_2"), "QID2")
+        self.assertEqual(self.definition.columns_for_question("QID2"), ("Q2_1", "Q2_2"))
+        self.assertEqual(self.definition.columns_for_question("QID99"), ())
+
+    def test_blocks_list_only_questions(self):
+        self.assertEqual(self.definition.blocks["BL_1"].question_ids, ("QID1", "QID2"))
+        self.assertEqual(self.definition.block_for_question("QID2").block_id, "BL_1")
+
+    def test_summary_and_embedded_data(self):
+        self.assertEqual(self.definition.summary.survey_id, "SV_123")
+        self.assertEqual(self.definition.embedded_data, ("source",))
+        self.assertEqual(set(self.definition.questions), {"QID1", "QID2"})
+
+
+class ResponseExportSpecTestCase(TestCase):
+
+    def setUp(self):
+        self.definition = SurveyDefinition.from_dict(SURVEY_DEFINITION)
+
+    def test_to_body_only_sets_given_options(self):
+        self.assertEqual(ResponseExportSpec().to_body(), {})
+        self.assertEqual(
+            ResponseExportSpec(
+                question_ids=("QID1",),
+                survey_metadata_ids=["recordedDate"],
+                start_date="2020-01-01T00:00:00Z",
+                end_date=datetime(2020, 2, 1, 1, tzinfo=timezone.utc),
+                compress=False,
+            ).to_body(),
+            {
+                "questionIds": ["QID1"],
+                "surveyMetadataIds": ["recordedDate"],
+                "startDate": "2020-01-01T00:00:00Z",
+                "endDate": "2020-02-01T01:00:00Z",
+                "compress": False,
+            },
+        )
+
+    def test_validate_reports_every_problem(self):
+        ResponseExportSpec(question_ids=["QID2"], embedded_data_ids=["source"]).validate(self.definition)
+
+        spec = ResponseExportSpec(
+            question_ids=["QID1", "QID9"],
+            embedded_data_ids=["campaign"],
+            survey_metadata_ids=["shoeSize"],
+            start_date="2020-02-01T00:00:00Z",
+            end_date="2020-01-01T00:00:00Z",
+        )
+        with self.assertRaises(InputError) as context:
+            spec.validate(self.definition)
+
+        message = str(context.exception)
+        for part in ("QID9", "campaign", "shoeSize", "start_date"):
+            self.assertIn(part, message)
+        self.assertNotIn("QID1", message)
+
+    def test_validate_compares_naive_dates_as_utc(self):
+        ResponseExportSpec(start_date=datetime(2024, 1, 1), end_date="2024-02-01T00:00:00Z").validate(self.definition)
+
+        with self.assertRaises(InputError):
+            ResponseExportSpec(
+                start_date=datetime(2024, 1, 1, 1), end_date="2024-01-01T02:00:00+02:00",
+            ).validate(self.definition)
+
+    def test_estimate_size_counts_selected_columns(self):
+        everything = ResponseExportSpec().estimate_size(self.definition)
+        projected = ResponseExportSpec(
+            question_ids=["QID2"], embedded_data_ids=[], survey_metadata_ids=["recordedDate"],
+        ).estimate_size(self.definition)
+
+        self.assertEqual(everything.reduction, 0.0)
+        self.assertEqual(projected.total_columns, everything.total_columns)
+        self.assertEqual(projected.selected_columns, 3)
+        self.assertAlmostEqual(projected.reduction, 1 - 3 / everything.total_columns)
@@ -0,0 +1,64 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from pyqual.exceptions import InputError
+from pyqual.reader import ExportReader
+
+CSV_EXPORT = (
+    '﻿StartDate,ResponseId,Q1\r\n'
+    'Start Date,Response ID,"Tell us more"\r\n'
+    '{"ImportId":"startDate"},{"ImportId":"_recordId"},{"ImportId":"QID1"}\r\n'
+    '2024-01-01,R_1,"Line one\r\nline two, with ""quotes"""\r\n'
+    '2024-01-02,R_2,Short\r\n'
+    '2024-01-03,R_3,"Ünïcode"\r\n'
+)
+
+
+class ExportReaderTestCase(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.csv_path = self.root / "Survey.csv"
+        self.csv_path.write_bytes(CSV_EXPORT.encode("utf-8"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_csv_lookup_handles_multiline_quoted_answers(self):
+        with ExportReader(self.csv_path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader.get("R_1")["Q1"], 'Line one\r\nline two, with "quotes"')
+            self.assertEqual(reader.get("R_2"), {"StartDate": "2024-01-02", "ResponseId": "R_2", "Q1": "Short"})
+            self.assertEqual(reader.get("R_3")["Q1"], "Ünïcode")
+            self.assertNotIn("R_4", reader)
+
+    def test_index_is_saved_and_reused(self):
+        ExportReader(self.csv_path).close()
+        self.assertTrue((self.root / "Survey.csv.idx.json").exists())
+
+        with mock.patch.object(ExportReader, "_build_index") as build_index:
+            with ExportReader(self.csv_path) as reader:
+                self.assertEqual(reader.get("R_2")["Q1"], "Short")
+            build_index.assert_not_called()
+
+    def test_stale_index_is_rebuilt(self):
+        ExportReader(self.csv_path).close()
+        self.csv_path.write_bytes((CSV_EXPORT + "2024-01-04,R_4,Added later\r\n").encode("utf-8"))
+
+        with ExportReader(self.csv_path) as reader:
+            self.assertEqual(reader.get("R_4")["Q1"], "Added later")
+
+    def test_ndjson_lookup(self):
+        path = self.root / "Survey.ndjson"
+        path.write_text("\n".join(json.dumps({"responseId": f"R_{index}", "values": {"QID1": index}})
+                                  for index in range(3)) + "\n")
+
+        with ExportReader(path) as reader:
+            self.assertEqual(reader.get("R_2"), {"responseId": "R_2", "values": {"QID1": 2}})
+
+    def test_unsupported_format(self):
+        with self.assertRaises(InputError):
+            ExportReader(self.root / "Survey.sav")
@@ -0,0 +1,268 @@
+import threading
+import time
+from unittest import TestCase, mock
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, HTTPError, ReadTimeout
+
+from pyqual.client import BaseClient
+from pyqual.exceptions import CircuitOpenError
+from pyqual.resilience import CircuitBreaker, HedgePolicy, RetryPolicy
+
+PROGRESS_URL = 'https://fra1.qualtrics.com/API/v3/surveys/SV_1/export-responses/ES_1'
+EXPORT_URL = 'https://fra1.qualtrics.com/API/v3/surveys/SV_1/export-responses/'
+FILE_URL = 'https://fra1.qualtrics.com/API/v3/surveys/SV_1/export-responses/ES_1/file'
+
+
+def _status_response(status_code, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {}, content=b'error')
+    response.json.side_effect = ValueError
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(response=response)
+    return response
+
+
+class RetryPolicyTestCase(TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=3, backoff_factor=1, max_backoff=3)
+
+    @mock.patch('pyqual.resilience.random.uniform', side_effect=lambda low, high: high)
+    def test_backoff_grows_exponentially_up_to_cap(self, _):
+        self.assertEqual([self.policy.backoff(number) for number in range(1, 5)], [1, 2, 3, 3])
+
+    def test_idempotency_rules(self):
+        read_timeout = ReadTimeout('slow')
+        self.assertTrue(self.policy.is_retryable('GET', read_timeout))
+        self.assertFalse(self.policy.is_retryable('POST', read_timeout))
+        self.assertTrue(self.policy.is_retryable('POST', ConnectTimeout('no connection')))
+        self.assertTrue(self.policy.is_retryable('GET', HTTPError(response=_status_response(503))))
+        self.assertFalse(self.policy.is_retryable('POST', HTTPError(response=_status_response(503))))
+        self.assertTrue(self.policy.is_retryable('POST', HTTPError(response=_status_response(429))))
+        self.assertFalse(self.policy.is_retryable('GET', HTTPError(response=_status_response(404))))
+        self.assertFalse(self.policy.is_retryable('GET', CircuitOpenError('open')))
+
+    def test_next_delay_respects_retry_after_and_budget(self):
+        error = HTTPError(response=_status_response(429, {'Retry-After': '2'}))
+
+        self.assertEqual(self.policy.next_delay('GET', error, retries=0, elapsed=0), 2)
+        self.assertIsNone(self.policy.next_delay('GET', error, retries=3, elapsed=0))
+        self.assertIsNone(RetryPolicy(total_timeout=1).next_delay('GET', error, retries=0, elapsed=0))
+
+
+class ClientRetryTestCase(TestCase):
+
+    def setUp(self):
+        sleep_patcher = mock.patch.object(RetryPolicy, 'sleep')
+        self.mock_sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def _client(self, *responses, policy=None):
+        client = BaseClient(token='ABC', retry=policy or RetryPolicy(max_retries=3))
+        client.transport = mock.Mock()
+        client.transport.request.side_effect = list(responses)
+        return client
+
+    def test_get_retried_on_server_error_until_success(self):
+        ok = _status_response(200)
+        client = self._client(_status_response(503), ReadTimeout('slow'), ok)
+
+        self.assertIs(client._make_request('GET', url=PROGRESS_URL), ok)
+        self.assertEqual(client.transport.request.call_count, 3)
+        self.assertEqual(self.mock_sleep.call_count, 2)
+
+    def test_exhausted_retries_are_reported_on_exception(self):
+        client = self._client(*[_status_response(502)] * 4)
+
+        with self.assertRaises(HTTPError) as context:
+            client._make_request('GET', url=PROGRESS_URL)
+
+        self.assertEqual(context.exception.retries, 3)
+        self.assertIn('after 3 retries', str(context.exception))
+        self.assertEqual(context.exception.response.status_code, 502)
+
+    def test_export_post_not_retried_after_read_timeout(self):
+        client = self._client(ReadTimeout('slow'))
+
+        with self.assertRaises(ReadTimeout) as context:
+            client._make_request('POST', url=EXPORT_URL, json={'format': 'csv'})
+
+        self.assertEqual(context.exception.retries, 0)
+        self.assertEqual(client.transport.request.call_count, 1)
+
+    def test_export_post_retried_when_connection_never_established(self):
+        ok = _status_response(200)
+        client = self._client(ConnectTimeout('no route'), ok)
+
+        self.assertIs(client._make_request('POST', url=EXPORT_URL, json={'format': 'csv'}), ok)
+
+    def test_integer_retry_keeps_previous_meaning(self):
+        self.assertEqual(BaseClient(token='ABC', retry=3).retry_policy.max_retries, 3)
+        self.assertEqual(BaseClient(token='ABC', retry=1).retry_policy.max_retries, 0)
+
+
+class HedgePolicyTestCase(TestCase):
+
+    def test_no_delay_until_enough_samples(self):
+        policy = HedgePolicy(percentile=0.9, window=10, min_samples=5)
+        for _ in range(4):
+            policy.record('GET export_progress', 0.1)
+
+        self.assertIsNone(policy.delay('GET export_progress'))
+
+    def test_delay_tracks_percentile_of_window(self):
+        policy = HedgePolicy(percentile=0.9, window=10, min_samples=5, min_delay=0)
+        for latency in range(1, 21):
+            policy.record('GET export_progress', latency / 100)
+
+        # Only the latest ten latencies (0.11 .. 0.20) remain in the window.
+        self.assertAlmostEqual(policy.delay('GET export_progress'), 0.20)
+        self.assertIsNone(policy.delay('GET get_survey'))
+
+
+class CircuitBreakerTestCase(TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: self.now)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure('GET export_progress')
+        self.breaker.before_request('GET export_progress')
+        self.breaker.record_failure('GET export_progress')
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request('GET export_progress')
+        self.breaker.before_request('GET get_survey')
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure('GET export_progress')
+        self.breaker.record_success('GET export_progress')
+        self.breaker.record_failure('GET export_progress')
+
+        self.assertFalse(self.breaker.is_open('GET export_progress'))
+
+    def test_half_open_allows_single_trial(self):
+        self.breaker.record_failure('GET export_progress')
+        self.breaker.record_failure('GET export_progress')
+        self.now = 10
+
+        self.breaker.before_request('GET export_progress')
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request('GET export_progress')
+
+        self.breaker.record_failure('GET export_progress')
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request('GET export_progress')
+
+        self.now = 20
+        self.breaker.before_request('GET export_progress')
+        self.breaker.record_success('GET export_progress')
+        self.assertFalse(self.breaker.is_open('GET export_progress'))
+
+
+class ClientResilienceTestCase(TestCase):
+
+    def test_circuit_breaker_fails_fast_once_open(self):
+        client = BaseClient(token='ABC', retry=0, circuit_breaker=CircuitBreaker(failure_threshold=2))
+        client.transport = mock.Mock()
+        client.transport.request.side_effect = RequestsConnectionError('down')
+
+        for _ in range(2):
+            with self.assertRaises(RequestsConnectionError):
+                client._make_request('GET', url=PROGRESS_URL)
+        with self.assertRaises(CircuitOpenError):
+            client._make_request('GET', url=PROGRESS_URL)
+
+        self.assertEqual(client.transport.request.call_count, 2)
+
+    def test_server_errors_count_as_failures(self):
+        client = BaseClient(token='ABC', retry=0, circuit_breaker=CircuitBreaker(failure_threshold=1))
+        response = mock.Mock(status_code=503)
+        response.raise_for_status.side_effect = RequestsConnectionError('unavailable')
+        client.transport = mock.Mock()
+        client.transport.request.return_value = response
+
+        with self.assertRaises(RequestsConnectionError):
+            client._make_request('GET', url=PROGRESS_URL)
+
+        self.assertTrue(client.circuit_breaker.is_open('GET export_progress'))
+
+    def test_slow_get_is_hedged_and_fastest_answer_wins(self):
+        policy = HedgePolicy(min_samples=1, window=1, min_delay=0)
+        policy.record('GET export_progress', 0.01)
+        client = BaseClient(token='ABC', hedge=policy)
+
+        slow = mock.Mock(name='slow', status_code=200)
+        fast = mock.Mock(name='fast', status_code=200)
+        release_slow = threading.Event()
+        calls = []
+
+        def request(method, url, **kwargs):
+            calls.append(method)
+            if len(calls) == 1:
+                release_slow.wait(5)
+                return slow
+            return fast
+
+        client.transport = mock.Mock()
+        client.transport.request.side_effect = request
+
+        started = time.perf_counter()
+        response = client._make_request('GET', url=PROGRESS_URL)
+        elapsed = time.perf_counter() - started
+        release_slow.set()
+
+        self.assertIs(response, fast)
+        self.assertLess(elapsed, 1)
+        self.assertEqual(calls, ['GET', 'GET'])
+
+    def test_hedge_delay_tracks_primary_latency_not_the_winner(self):
+        policy = HedgePolicy(min_samples=1, window=1, min_delay=0)
+        policy.record('GET export_progress', 0.01)
+        client = BaseClient(token='ABC', retry=0, hedge=policy)
+        release_primary = threading.Event()
+        calls = []
+
+        def request(method, url, **kwargs):
+            calls.append(method)
+            if len(calls) == 1:
+                release_primary.wait(5)
+                time.sleep(0.2)
+                raise RequestsConnectionError('primary gave up')
+            return mock.Mock(status_code=200)
+
+        client.transport = mock.Mock()
+        client.transport.request.side_effect = request
+
+        client._make_request('GET', url=PROGRESS_URL)
+        self.assertLess(policy.delay('GET export_progress'), 0.2)
+
+        release_primary.set()
+        client._hedge_executor.shutdown(wait=True)
+        self.assertGreaterEqual(policy.delay('GET export_progress'), 0.2)
+
+    def test_post_is_never_hedged(self):
+        policy = HedgePolicy(min_samples=1, window=1, min_delay=0)
+        client = BaseClient(token='ABC', hedge=policy)
+        client.transport = mock.Mock()
+        client.transport.request.return_value = mock.Mock(status_code=200)
+
+        client._make_request('POST', url=PROGRESS_URL, json={})
+
+        client.transport.request.assert_called_once()
+        self.assertIsNone(policy.delay('POST export'))
+
+    def test_file_download_is_not_hedged(self):
+        policy = HedgePolicy(min_samples=1, window=1, min_delay=0)
+        policy.record('GET export_file', 0.01)
+        client = BaseClient(token='ABC', hedge=policy)
+        client.transport = mock.Mock()
+        client.transport.request.side_effect = lambda method, url, **kwargs: time.sleep(0.1) or mock.Mock(
+            status_code=200
+        )
+
+        client._make_request('GET', url=FILE_URL)
+
+        client.transport.request.assert_called_once()
+        self.assertIsNone(client._hedge_executor)
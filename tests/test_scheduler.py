@@ -0,0 +1,229 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError
+
+from pyqual.exceptions import ExportFailureError
+from pyqual.scheduler import COMPLETE, FAILED, QUEUED, READY, STARTED, ExportJobStore, ExportScheduler
+
+
+def _http_error(status_code):
+    return HTTPError(f"{status_code} error", response=mock.Mock(status_code=status_code))
+
+
+def _start_response(progress_id):
+    response = mock.Mock()
+    response.json.return_value = {"result": {"progressId": progress_id}}
+    return response
+
+
+class ExportSchedulerTestCase(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "jobs.sqlite"
+        self.store = ExportJobStore(self.db_path)
+        self.client = mock.Mock()
+        self.client.download_export.side_effect = lambda survey_id, file_id, output_dir, **kwargs: Path(output_dir)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_run_completes_job_and_persists_every_step(self):
+        self.client.start_response_export.return_value = _start_response("ES_1")
+        self.client.wait_for_export.return_value = "file-1"
+        scheduler = ExportScheduler(self.client, self.store, poll_interval=0)
+
+        job = scheduler.submit("SV_1", "csv", output_dir="out", body={"compress": True})
+        self.assertEqual(job.status, QUEUED)
+
+        finished = scheduler.run()
+
+        self.assertEqual([job.status for job in finished], [COMPLETE])
+        stored = self.store.get(job.job_id)
+        self.assertEqual((stored.progress_id, stored.file_id, stored.output_path), ("ES_1", "file-1", "out"))
+        self.assertEqual(stored.body, {"compress": True})
+        self.client.start_response_export.assert_called_once_with("SV_1", "csv", None, body={"compress": True})
+
+    def test_restart_resumes_started_job_without_new_export(self):
+        self.client.start_response_export.return_value = _start_response("ES_1")
+        self.client.wait_for_export.side_effect = RequestsConnectionError("worker lost connection")
+        ExportScheduler(self.client, self.store).submit("SV_1", "csv")
+        ExportScheduler(self.client, self.store).run()
+
+        self.assertEqual(self.store.pending()[0].status, STARTED)
+
+        self.store.close()
+        self.store = ExportJobStore(self.db_path)
+        restarted_client = mock.Mock()
+        restarted_client.wait_for_export.return_value = "file-1"
+        restarted_client.download_export.return_value = Path("out")
+
+        finished = ExportScheduler(restarted_client, self.store).run()
+
+        self.assertEqual(finished[0].status, COMPLETE)
+        restarted_client.start_response_export.assert_not_called()
+        restarted_client.wait_for_export.assert_called_once_with(
+            "SV_1", "ES_1", max_polls=120, poll_interval=1.0, listener=None
+        )
+
+    def test_restart_downloads_ready_job_without_polling(self):
+        self.client.start_response_export.return_value = _start_response("ES_1")
+        self.client.wait_for_export.return_value = "file-1"
+        self.client.download_export.side_effect = RequestsConnectionError("download interrupted")
+        scheduler = ExportScheduler(self.client, self.store)
+        scheduler.submit("SV_1", "csv")
+        scheduler.run()
+        self.assertEqual(self.store.pending()[0].status, READY)
+
+        self.client.reset_mock()
+        self.client.download_export.side_effect = None
+        self.client.download_export.return_value = Path("out")
+
+        ExportScheduler(self.client, self.store).run()
+
+        self.client.wait_for_export.assert_not_called()
+        self.client.download_export.assert_called_once_with(
+            "SV_1", "file-1", "MyQualtricsDownload", file_format="csv"
+        )
+
+    def test_failed_export_is_not_retried(self):
+        self.client.start_response_export.return_value = _start_response("ES_1")
+        self.client.wait_for_export.side_effect = ExportFailureError("Export failed")
+        scheduler = ExportScheduler(self.client, self.store)
+        job = scheduler.submit("SV_1", "csv")
+
+        scheduler.run()
+
+        self.assertEqual(self.store.get(job.job_id).status, FAILED)
+        self.assertEqual(self.store.pending(), [])
+
+    def test_client_errors_fail_the_job(self):
+        self.client.start_response_export.side_effect = _http_error(404)
+        scheduler = ExportScheduler(self.client, self.store)
+        job = scheduler.submit("SV_missing", "csv")
+
+        scheduler.run()
+
+        stored = self.store.get(job.job_id)
+        self.assertEqual(stored.status, FAILED)
+        self.assertEqual(stored.error, "404 error")
+        self.assertEqual(self.store.pending(), [])
+
+    def test_rate_limits_and_server_errors_keep_the_job_pending(self):
+        for status_code in (429, 503):
+            self.client.start_response_export.side_effect = _http_error(status_code)
+            job = ExportScheduler(self.client, self.store).submit("SV_1", "csv")
+
+            ExportScheduler(self.client, self.store).run()
+
+            self.assertEqual(self.store.get(job.job_id).status, QUEUED)
+
+    def test_expired_file_restarts_the_export(self):
+        self.client.start_response_export.side_effect = [_start_response("ES_1"), _start_response("ES_2")]
+        self.client.wait_for_export.side_effect = ["file-1", "file-2"]
+        self.client.download_export.side_effect = [_http_error(404), Path("out")]
+        scheduler = ExportScheduler(self.client, self.store)
+        job = scheduler.submit("SV_1", "csv")
+
+        scheduler.run()
+        expired = self.store.get(job.job_id)
+        self.assertEqual((expired.status, expired.progress_id, expired.file_id), (QUEUED, None, None))
+
+        scheduler.run()
+        finished = self.store.get(job.job_id)
+        self.assertEqual((finished.status, finished.progress_id, finished.file_id), (COMPLETE, "ES_2", "file-2"))
+
+    def test_schedulers_sharing_a_store_claim_each_job_once_within_the_global_limit(self):
+        started, running, peak = [], [0], [0]
+        lock = threading.Lock()
+
+        def start(survey_id, *args, **kwargs):
+            with lock:
+                started.append(survey_id)
+            return _start_response(f"ES_{survey_id}")
+
+        def wait_for_export(*args, **kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return "file"
+
+        self.client.start_response_export.side_effect = start
+        self.client.wait_for_export.side_effect = wait_for_export
+        for index in range(8):
+            ExportScheduler(self.client, self.store).submit(f"SV_{index}", "csv")
+
+        stores = [ExportJobStore(self.db_path) for _ in range(2)]
+        schedulers = [ExportScheduler(self.client, store, max_concurrency=2, poll_interval=0.01) for store in stores]
+        threads = [threading.Thread(target=scheduler.run) for scheduler in schedulers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for store in stores:
+            store.close()
+
+        self.assertEqual(sorted(started), [f"SV_{index}" for index in range(8)])
+        self.assertLessEqual(peak[0], 2)
+        self.assertEqual({job.status for job in self.store.jobs()}, {COMPLETE})
+
+    def test_expired_lease_can_be_claimed_again(self):
+        job = ExportScheduler(self.client, self.store).submit("SV_1", "csv")
+
+        self.assertEqual(self.store.claim("crashed", lease_seconds=0.05, max_running=1).job_id, job.job_id)
+        self.assertIsNone(self.store.claim("other", lease_seconds=60, max_running=2))
+        time.sleep(0.1)
+        self.assertEqual(self.store.claim("other", lease_seconds=60, max_running=1).job_id, job.job_id)
+
+    def test_submit_rejects_unsupported_format(self):
+        scheduler = ExportScheduler(self.client, self.store)
+
+        with self.assertRaises(ValueError):
+            scheduler.submit("SV_1", "xlsx")
+
+        self.assertEqual(self.store.jobs(), [])
+
+    def test_unexpected_error_fails_job_and_keeps_worker_running(self):
+        def start(survey_id, *args, **kwargs):
+            if survey_id == "SV_broken":
+                return mock.Mock(**{"json.return_value": {"result": {}}})
+            return _start_response("ES_1")
+
+        self.client.start_response_export.side_effect = start
+        self.client.wait_for_export.return_value = "file-1"
+        scheduler = ExportScheduler(self.client, self.store, max_concurrency=1)
+        broken = scheduler.submit("SV_broken", "csv", priority=5)
+        valid = scheduler.submit("SV_valid", "csv")
+
+        finished = scheduler.run()
+
+        self.assertEqual([job.status for job in finished], [FAILED, COMPLETE])
+        self.assertEqual(self.store.get(broken.job_id).error, "KeyError: 'progressId'")
+        self.assertEqual(self.store.get(valid.job_id).status, COMPLETE)
+
+    def test_higher_priority_jobs_start_first(self):
+        started = []
+
+        def start(survey_id, *args, **kwargs):
+            started.append(survey_id)
+            return _start_response(f"ES_{survey_id}")
+
+        self.client.start_response_export.side_effect = start
+        self.client.wait_for_export.return_value = "file"
+        scheduler = ExportScheduler(self.client, self.store, max_concurrency=1)
+        scheduler.submit("SV_low", "csv", priority=0)
+        scheduler.submit("SV_high", "csv", priority=10)
+        scheduler.submit("SV_mid", "csv", priority=5)
+
+        scheduler.run()
+
+        self.assertEqual(started, ["SV_high", "SV_mid", "SV_low"])
@@ -0,0 +1,129 @@
+import importlib.util
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, skipUnless
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, Timeout
+
+from pyqual.client import BaseClient
+from pyqual.transport import TRANSPORTS, RequestsTransport, Transport, Urllib3Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        if self.path.startswith('/missing'):
+            self._reply(404, {"meta": {"error": {"errorMessage": "Survey not found"}}})
+            return
+        self._reply(200, {"result": {"path": self.path, "token": self.headers.get('X-API-TOKEN')}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self._reply(200, {"result": {
+            "body": json.loads(self.rfile.read(length)),
+            "contentType": self.headers.get('Content-Type'),
+        }})
+
+
+class _QuietServer(ThreadingHTTPServer):
+
+    def handle_error(self, request, client_address):
+        # Clients that time out close the socket before the slow reply is written.
+        pass
+
+
+class _TransportTests:
+    transport = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = _QuietServer(('127.0.0.1', 0), _Handler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = BaseClient(token='ABC', transport=self.transport, retry=0)
+
+    def tearDown(self):
+        self.client.__exit__()
+
+    def test_get_with_params_and_token(self):
+        response = self.client._make_request('GET', url=f'{self.url}/surveys', params={'offset': 100})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['result'], {'path': '/surveys?offset=100', 'token': 'ABC'})
+
+    def test_post_json(self):
+        response = self.client._make_request('POST', url=f'{self.url}/export', json={'format': 'csv'})
+
+        self.assertEqual(response.json()['result'], {'body': {'format': 'csv'}, 'contentType': 'application/json'})
+
+    def test_http_error_carries_qualtrics_message(self):
+        with self.assertRaises(HTTPError) as context:
+            self.client._make_request('GET', url=f'{self.url}/missing')
+
+        self.assertIn('Survey not found', str(context.exception))
+
+    def test_timeout(self):
+        self.client.timeout = 0.1
+
+        with self.assertRaises(Timeout):
+            self.client._make_request('GET', url=f'{self.url}/slow')
+
+    def test_connection_error(self):
+        with self.assertRaises(RequestsConnectionError):
+            self.client._make_request('GET', url='http://127.0.0.1:9/unreachable')
+
+
+class RequestsTransportTestCase(_TransportTests, TestCase):
+    transport = 'requests'
+
+
+class Urllib3TransportTestCase(_TransportTests, TestCase):
+    transport = 'urllib3'
+
+
+@skipUnless(importlib.util.find_spec('httpx'), 'httpx is not installed')
+class HttpxTransportTestCase(_TransportTests, TestCase):
+    transport = 'httpx'
+
+
+class TransportSelectionTestCase(TestCase):
+
+    def test_transport_by_name_and_class(self):
+        self.assertIsInstance(BaseClient(token='ABC').transport, RequestsTransport)
+        self.assertIsInstance(BaseClient(token='ABC', transport='urllib3').transport, Urllib3Transport)
+        self.assertIsInstance(BaseClient(token='ABC', transport=Urllib3Transport).transport, Urllib3Transport)
+        self.assertEqual(set(TRANSPORTS), {'requests', 'urllib3', 'httpx'})
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            BaseClient(token='ABC', transport='curl')
+
+    def test_transport_without_request_cannot_be_built(self):
+        class Incomplete(Transport):
+            name = 'incomplete'
+
+        with self.assertRaises(TypeError):
+            Incomplete()